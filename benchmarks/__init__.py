@@ -0,0 +1 @@
+"""Benchmarks for the Salus Enhanced integration."""
@@ -0,0 +1,108 @@
+"""Replay a recorded gateway trace through the coordinator and entities.
+
+Run from the repository root::
+
+    python -m benchmarks.replay salus.trace --gateway it600 --profile replay.prof
+
+Every recorded snapshot is fed, as fast as possible, through a coordinator
+refresh to one entity per device, as it would be in Home Assistant. Reports
+the refresh and entity update timings as JSON; ``--profile`` also writes a
+cProfile of the replay, for ``python -m pstats`` or snakeviz.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+from collections.abc import Iterable
+import json
+import logging
+import sys
+import tempfile
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.salus_enhanced.coordinator import SalusDataUpdateCoordinator
+from custom_components.salus_enhanced.gateway import create_gateway
+from custom_components.salus_enhanced.replay import ReplayGateway
+
+from .run import add_entities, summarize
+
+
+async def refresh(coordinator: SalusDataUpdateCoordinator) -> None:
+    """Refresh once, reconnecting right away after a recorded poll error.
+
+    The session would reconnect after its backoff, and until then every
+    refresh would fail without replaying anything.
+    """
+    await coordinator.async_refresh()
+    if not (session := coordinator.session).connected:
+        session.async_cancel()
+        await session.gateway.reconnect()
+        session.connected = True
+
+
+async def replay(args: argparse.Namespace) -> dict[str, Any]:
+    """Play a trace through a coordinator once."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        gateway = create_gateway(args.gateway, replay=args.trace, speed=0)
+        assert isinstance(gateway, ReplayGateway)
+        gateway.loop = False
+        coordinator = SalusDataUpdateCoordinator(hass, gateway, args.gateway, "replay")
+        # the trace may start with errors
+        while coordinator.data is None and not gateway.finished:
+            await refresh(coordinator)
+        updates = [0]
+        entities = add_entities(hass, coordinator, updates) if coordinator.data else 0
+
+        profiler = cProfile.Profile() if args.profile else None
+        refresh_times: list[float] = []
+        if profiler is not None:
+            profiler.enable()
+        while not gateway.finished:
+            started = time.perf_counter()
+            await refresh(coordinator)
+            refresh_times.append(time.perf_counter() - started)
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(args.profile)
+
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+
+    return {
+        "trace": args.trace,
+        "gateway": args.gateway,
+        "snapshots": coordinator.metrics.polls,
+        "recorded_commands": len(gateway.recorded_commands),
+        "entities": entities,
+        "refresh_ms": summarize(refresh_times),
+        "entity_updates": updates[0],
+        "poll_errors": coordinator.metrics.errors,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("trace", help="trace file recorded by the integration")
+    parser.add_argument("--gateway", choices=("it600", "it500"), default="it600")
+    parser.add_argument("--profile", help="write a cProfile of the replay here")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    """Replay the trace and print the report."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # Entities are updated without an entity platform on purpose
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    json.dump(asyncio.run(replay(args)), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
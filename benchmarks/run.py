@@ -0,0 +1,325 @@
+"""Benchmark polling and entity updates against the fake gateways.
+
+Run from the repository root::
+
+    python -m benchmarks.run --devices 10 100 1000 --output results.json
+
+Reports, per gateway type and device count, the poll latency, the time
+spent turning library objects into state records, the CPU time the event
+loop thread spent per poll, entity update throughput, allocations and
+peak memory, as JSON. ``--no-offload`` keeps IT600 decryption and parsing
+on the event loop, for comparison.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterable
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+import aiohttp
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+
+from custom_components.salus_enhanced.binary_sensor import SalusBinarySensor
+from custom_components.salus_enhanced.climate import SalusClimate
+from custom_components.salus_enhanced.coordinator import SalusDataUpdateCoordinator
+from custom_components.salus_enhanced.cover import SalusCover
+from custom_components.salus_enhanced.entity import SalusEntity
+from custom_components.salus_enhanced import gateway as gateway_module
+from custom_components.salus_enhanced.gateway import (
+    IT500Gateway,
+    IT600Gateway,
+    SalusGatewayBase,
+    acquire_it500_client,
+)
+from custom_components.salus_enhanced.ratelimit import CloudRequestQueue
+from custom_components.salus_enhanced.sensor import SalusSensor
+from custom_components.salus_enhanced.switch import SalusSwitch
+
+from .simulator import DEFAULT_EUID, FakeIT500Api, FakeIT500Cloud, FakeIT600Gateway
+
+ENTITY_TYPES: dict[str, type[SalusEntity]] = {
+    "climate": SalusClimate,
+    "binary_sensor": SalusBinarySensor,
+    "sensor": SalusSensor,
+    "switch": SalusSwitch,
+    "cover": SalusCover,
+}
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return p50/p95/max of timings, in milliseconds."""
+    if not samples:
+        return {}
+    ms = sorted(sample * 1000 for sample in samples)
+    p95 = ms[min(len(ms) - 1, round(0.95 * (len(ms) - 1)))]
+    return {
+        "p50": round(statistics.median(ms), 3),
+        "p95": round(p95, 3),
+        "max": round(ms[-1], 3),
+    }
+
+
+def add_entities(
+    hass: HomeAssistant,
+    coordinator: SalusDataUpdateCoordinator,
+    counter: list[int],
+) -> int:
+    """Attach one entity per device to the coordinator; return the count."""
+    count = 0
+    for category, devices in coordinator.data.items():
+        entity_type = ENTITY_TYPES[category]
+        for device_id, device in devices.items():
+            entity = entity_type(coordinator, None, device_id, device)
+            entity.hass = hass
+            entity.entity_id = f"{category}.bench_{device_id}"
+
+            def update(entity: SalusEntity = entity) -> None:
+                counter[0] += 1
+                entity._handle_coordinator_update()
+
+            coordinator.async_add_listener(update, entity.coordinator_context)
+            count += 1
+    return count
+
+
+async def measure(
+    hass: HomeAssistant,
+    gateway: SalusGatewayBase,
+    gateway_type: str,
+    polls: int,
+    fetch: Callable[[], Any],
+    build: Callable[[], dict[str, dict[str, Any]]],
+) -> dict[str, Any]:
+    """Poll a connected gateway and feed every snapshot to its entities."""
+    coordinator = SalusDataUpdateCoordinator(hass, gateway, gateway_type, "bench")
+    await fetch()
+    coordinator.async_set_updated_data(build())
+    updates = [0]
+    entities = add_entities(hass, coordinator, updates)
+
+    poll_times: list[float] = []
+    build_times: list[float] = []
+    loop_times: list[float] = []
+    update_times: list[float] = []
+    for _ in range(polls):
+        loop_started = time.thread_time()
+        started = time.perf_counter()
+        await fetch()
+        fetched = time.perf_counter()
+        data = build()
+        built = time.perf_counter()
+        loop_times.append(time.thread_time() - loop_started)
+        coordinator.async_set_updated_data(data)
+        poll_times.append(built - started)
+        build_times.append(built - fetched)
+        update_times.append(time.perf_counter() - built)
+
+    # One more cycle under tracemalloc, which would skew the timings above
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    await fetch()
+    coordinator.async_set_updated_data(build())
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    await coordinator.async_shutdown()
+
+    allocations = sum(
+        max(stat.count_diff, 0) for stat in after.compare_to(before, "filename")
+    )
+    update_seconds = sum(update_times)
+    return {
+        "entities": entities,
+        "poll_ms": summarize(poll_times),
+        "build_ms": summarize(build_times),
+        "loop_ms": summarize(loop_times),
+        "update_ms": summarize(update_times),
+        "entity_updates": updates[0],
+        "entity_updates_per_s": (
+            round(updates[0] / update_seconds) if update_seconds else None
+        ),
+        "allocated_blocks_per_poll": allocations,
+        "peak_memory_kib_per_poll": round(peak / 1024, 1),
+    }
+
+
+async def bench_it600(
+    hass: HomeAssistant, devices: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Benchmark the IT600 wrapper against a fake UGE600."""
+    server = FakeIT600Gateway(devices, args.latency, args.jitter, args.change_rate)
+    await server.start()
+    gateway = IT600Gateway("127.0.0.1", DEFAULT_EUID, port=server.port)
+    if args.no_offload:
+        gateway.offload_size = gateway.offload_devices = sys.maxsize
+    try:
+        await gateway.connect()
+        result = await measure(
+            hass,
+            gateway,
+            "it600",
+            args.polls,
+            gateway._gateway.poll_status,
+            gateway._build_snapshot,
+        )
+    finally:
+        await gateway.close()
+        await server.stop()
+    result["requests"] = server.requests
+    return result
+
+
+async def bench_it500(
+    hass: HomeAssistant, devices: int, args: argparse.Namespace
+) -> dict[str, Any]:
+    """Benchmark the shared IT500 session against a fake cloud.
+
+    Every device is its own entry, as in a real install; one entry polls
+    and the shared session fetches all devices in one batch, through a
+    fresh request queue paced at ``--cloud-rate``.
+    """
+    server = FakeIT500Cloud(
+        devices,
+        args.latency,
+        args.jitter,
+        args.change_rate,
+        rate_limit=args.cloud_limit,
+    )
+    await server.start()
+    rate = args.cloud_rate or float(sys.maxsize)
+    queue = gateway_module.IT500_REQUEST_QUEUE = CloudRequestQueue(
+        rate, rate, 4, min(rate, 0.2), 30, 1
+    )
+    async with aiohttp.ClientSession() as session:
+        api = FakeIT500Api(session, f"http://127.0.0.1:{server.port}")
+        await api.async_login()
+        # Bypass the pyit500 login; the fake API is already logged in
+        client = acquire_it500_client("bench@example.com", "password")
+        client._client = api
+        gateways = [
+            IT500Gateway("bench@example.com", "password", device_id)
+            for device_id in server.device_ids
+        ]
+        for gateway in gateways:
+            gateway._client = client
+            client.register(gateway)
+        first = gateways[0]
+        raw: dict[str, Any] = {}
+
+        async def fetch() -> None:
+            # Start a new batch every poll instead of reusing the last one
+            client._batch = None
+            raw["device"] = await client.async_get_device(first.device_id)
+
+        try:
+            result = await measure(
+                hass,
+                first,
+                "it500",
+                args.polls,
+                fetch,
+                lambda: first._build_snapshot(raw["device"]),
+            )
+        finally:
+            for gateway in gateways:
+                await gateway.close()
+    await server.stop()
+    result["requests"] = server.requests
+    result["batches"] = client.batch_count
+    result["throttled"] = server.throttled
+    result["request_queue"] = queue.as_dict()
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Run every selected benchmark."""
+    benches = {"it600": bench_it600, "it500": bench_it500}
+    results = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for gateway_type in args.gateways:
+            for devices in args.devices:
+                result = await benches[gateway_type](hass, devices, args)
+                results.append({"gateway": gateway_type, "devices": devices, **result})
+                print(
+                    f"{gateway_type} {devices:>5} devices: "
+                    f"poll p50 {result['poll_ms'].get('p50')} ms",
+                    file=sys.stderr,
+                )
+        await hass.async_stop(force=True)
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "polls": args.polls,
+            "latency": args.latency,
+            "jitter": args.jitter,
+            "change_rate": args.change_rate,
+            "offload": not args.no_offload,
+            "cloud_rate": args.cloud_rate,
+            "cloud_limit": args.cloud_limit,
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: Iterable[str] | None = None) -> argparse.Namespace:
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument(
+        "--gateways", nargs="+", choices=("it600", "it500"), default=["it600", "it500"]
+    )
+    parser.add_argument("--polls", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.005)
+    parser.add_argument("--jitter", type=float, default=0.001)
+    parser.add_argument("--change-rate", type=float, default=0.1)
+    parser.add_argument(
+        "--no-offload",
+        action="store_true",
+        help="decrypt and parse IT600 responses on the event loop",
+    )
+    parser.add_argument(
+        "--cloud-rate",
+        type=float,
+        default=0,
+        help="IT500 requests per second let through by the queue (0: no limit)",
+    )
+    parser.add_argument(
+        "--cloud-limit",
+        type=int,
+        help="requests per second past which the fake IT500 cloud answers 429",
+    )
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: Iterable[str] | None = None) -> None:
+    """Run the benchmarks and write the JSON report."""
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    # Entities are updated without an entity platform on purpose
+    logging.getLogger("homeassistant.helpers.entity").setLevel(logging.ERROR)
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+"""Local fake Salus gateways for benchmarks.
+
+FakeIT600Gateway is an HTTP server speaking the encrypted UGE600 protocol
+that pyit600 expects (``/deviceid/read`` and ``/deviceid/write``).
+FakeIT500Cloud serves per-device JSON like the salus-it500.com cloud, and
+FakeIT500Api is a client for it with the ``async_get_device`` interface
+the integration uses from pyit500.
+
+Both emulate any number of devices, spread over all categories, and delay
+every response by ``latency`` seconds plus gaussian ``jitter``. The fake
+cloud can also throttle: past ``rate_limit`` requests in a second it
+answers 429 with a Retry-After header, as salus-it500.com does under load.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+DEFAULT_EUID = "0000000000000000"
+GATEWAY_MAC = "00:1E:5E:00:00:01"
+
+# Cluster that makes pyit600 pick up a device, and the model reported
+IT600_KINDS = (
+    ("climate", "sIT600TH", "HTRP-RF"),
+    ("binary_sensor", "sIASZS", "SW600"),
+    ("sensor", "sTempS", "PS600"),
+    ("switch", "sOnOffS", "SPE600"),
+    ("cover", "sLevelS", "RS600"),
+)
+
+
+class _FakeServer:
+    """aiohttp server with a simulated network delay."""
+
+    def __init__(self, latency: float, jitter: float, seed: int) -> None:
+        """Initialize the server."""
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = 0
+        self.port = 0
+        self._random = random.Random(seed)
+        self._runner: web.AppRunner | None = None
+
+    def _routes(self, app: web.Application) -> None:
+        """Add the request handlers."""
+        raise NotImplementedError
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Start listening; port 0 picks a free port."""
+        app = web.Application()
+        self._routes(app)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        """Stop listening."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self) -> None:
+        """Wait like a real network round trip would."""
+        self.requests += 1
+        delay = self.latency
+        if self.jitter:
+            delay += self._random.gauss(0, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class FakeIT600Gateway(_FakeServer):
+    """UGE600 gateway with ``device_count`` devices.
+
+    ``change_rate`` is the share of the devices read by a ``deviceid``
+    request whose state changed since they were last read.
+    """
+
+    def __init__(
+        self,
+        device_count: int,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        change_rate: float = 0.1,
+        euid: str = DEFAULT_EUID,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the gateway."""
+        from pyit600.encryptor import IT600Encryptor
+
+        super().__init__(latency, jitter, seed)
+        self.change_rate = change_rate
+        self._encryptor = IT600Encryptor(euid)
+        self._devices: dict[str, dict[str, Any]] = {
+            "gateway": {
+                "data": {"UniID": "gateway", "Endpoint": 0},
+                "sGateway": {
+                    "NetworkLANMAC": GATEWAY_MAC,
+                    "ModelIdentifier": "SAU2AG1-GW",
+                },
+            }
+        }
+        for index in range(device_count):
+            category, cluster, model = IT600_KINDS[index % len(IT600_KINDS)]
+            uid = f"{category}{index:05d}"
+            self._devices[uid] = {
+                "data": {"UniID": uid, "Endpoint": 1},
+                "DeviceL": {"ModelIdentifier_i": model},
+                "sZDO": {"DeviceName": json.dumps({"deviceName": uid})},
+                "sZDOInfo": {"OnlineStatus_i": 1},
+                cluster: self._initial_state(cluster),
+            }
+
+    @staticmethod
+    def _initial_state(cluster: str) -> dict[str, Any]:
+        """Return the starting state of a device cluster."""
+        if cluster == "sIT600TH":
+            return {
+                "LocalTemperature_x100": 2050,
+                "HeatingSetpoint_x100": 2100,
+                "HoldType": 2,
+                "RunningState": 0,
+            }
+        if cluster == "sIASZS":
+            return {"ErrorIASZSAlarmed1": 0}
+        if cluster == "sTempS":
+            return {"MeasuredValue_x100": 2000}
+        if cluster == "sOnOffS":
+            return {"OnOff": 0}
+        return {"CurrentLevel": 50, "MoveToLevel_f": "32FFFF"}
+
+    def _mutate(self, uids: list[str]) -> None:
+        """Change the state of ``change_rate`` of the given devices."""
+        uids = [uid for uid in uids if uid != "gateway"]
+        for uid in self._random.sample(uids, int(len(uids) * self.change_rate)):
+            device = self._devices[uid]
+            if (th := device.get("sIT600TH")) is not None:
+                th["LocalTemperature_x100"] += self._random.choice((-10, 10))
+                th["RunningState"] ^= 1
+            elif (ias := device.get("sIASZS")) is not None:
+                ias["ErrorIASZSAlarmed1"] ^= 1
+            elif (temp := device.get("sTempS")) is not None:
+                temp["MeasuredValue_x100"] += self._random.choice((-10, 10))
+            elif (onoff := device.get("sOnOffS")) is not None:
+                onoff["OnOff"] ^= 1
+            else:
+                level = device["sLevelS"]
+                level["CurrentLevel"] = self._random.randrange(0, 101)
+
+    def _routes(self, app: web.Application) -> None:
+        """Add the request handlers."""
+        app.router.add_post("/deviceid/read", self._handle_read)
+        app.router.add_post("/deviceid/write", self._handle_write)
+
+    async def _handle_read(self, request: web.Request) -> web.Response:
+        """Answer a readall (all devices) or deviceid (some devices) request."""
+        body = json.loads(self._encryptor.decrypt(await request.read()))
+        await self._delay()
+        if body.get("requestAttr") == "readall":
+            ids = list(self._devices.values())
+        else:
+            uids = [
+                item["data"]["UniID"]
+                for item in body.get("id", [])
+                if item["data"]["UniID"] in self._devices
+            ]
+            self._mutate(uids)
+            ids = [self._devices[uid] for uid in uids]
+        return self._reply({"status": "success", "id": ids})
+
+    async def _handle_write(self, request: web.Request) -> web.Response:
+        """Apply the written cluster values."""
+        body = json.loads(self._encryptor.decrypt(await request.read()))
+        await self._delay()
+        for item in body.get("id", []):
+            if (device := self._devices.get(item["data"]["UniID"])) is None:
+                continue
+            for key, values in item.items():
+                if key != "data" and isinstance(values, dict):
+                    device.setdefault(key, {}).update(values)
+        return self._reply({"status": "success", "id": []})
+
+    def _reply(self, payload: dict[str, Any]) -> web.Response:
+        """Return an encrypted JSON response."""
+        return web.Response(body=self._encryptor.encrypt(json.dumps(payload)))
+
+
+class FakeIT500Cloud(_FakeServer):
+    """salus-it500.com account with ``device_count`` thermostats."""
+
+    def __init__(
+        self,
+        device_count: int,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        change_rate: float = 0.1,
+        token: str = "fake-token",
+        seed: int = 0,
+        rate_limit: int | None = None,
+    ) -> None:
+        """Initialize the cloud."""
+        super().__init__(latency, jitter, seed)
+        self.change_rate = change_rate
+        self.token = token
+        self.rate_limit = rate_limit
+        self.throttled = 0
+        self._second = 0
+        self._second_requests = 0
+        self.logins = 0
+        self.device_ids = [str(10000000 + index) for index in range(device_count)]
+        self._devices = {
+            device_id: {
+                "product": "IT500",
+                "CH1currentTemperature": 20.5,
+                "CH1currentSetPoint": 21.0,
+                "CH1heatOnOff": 0,
+                "CH1heatOffOn": 1,
+                "CH1autoOff": "auto",
+            }
+            for device_id in self.device_ids
+        }
+
+    def _routes(self, app: web.Application) -> None:
+        """Add the request handlers."""
+        app.router.add_post("/login", self._handle_login)
+        app.router.add_get("/device/{device_id}", self._handle_device)
+        app.router.add_post("/device/{device_id}", self._handle_write)
+
+    async def _handle_login(self, request: web.Request) -> web.Response:
+        """Hand out the session token."""
+        await self._delay()
+        self.logins += 1
+        return web.json_response({"token": self.token})
+
+    def _throttle(self) -> None:
+        """Answer 429 once the requests of this second pass the rate limit."""
+        if self.rate_limit is None:
+            return
+        if (second := int(time.monotonic())) != self._second:
+            self._second = second
+            self._second_requests = 0
+        self._second_requests += 1
+        if self._second_requests > self.rate_limit:
+            self.throttled += 1
+            raise web.HTTPTooManyRequests(headers={"Retry-After": "1"})
+
+    def _device(self, request: web.Request) -> dict[str, Any]:
+        """Return the device of an authorized request."""
+        self._throttle()
+        if request.headers.get("Authorization") != f"Bearer {self.token}":
+            raise web.HTTPUnauthorized
+        if (device := self._devices.get(request.match_info["device_id"])) is None:
+            raise web.HTTPNotFound
+        return device
+
+    async def _handle_device(self, request: web.Request) -> web.Response:
+        """Return the state of one device, changing it now and then."""
+        device = self._device(request)
+        await self._delay()
+        if self._random.random() < self.change_rate:
+            device["CH1currentTemperature"] += self._random.choice((-0.1, 0.1))
+            device["CH1heatOnOff"] ^= 1
+        return web.json_response(device)
+
+    async def _handle_write(self, request: web.Request) -> web.Response:
+        """Apply written values to one device."""
+        device = self._device(request)
+        await self._delay()
+        device.update(await request.json())
+        return web.json_response({"status": "success"})
+
+
+class FakeIT500Api:
+    """Client of FakeIT500Cloud with the pyit500 device interface."""
+
+    def __init__(self, session: aiohttp.ClientSession, url: str) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._url = url
+        self._headers: dict[str, str] = {}
+
+    async def async_login(self) -> None:
+        """Get a session token."""
+        async with self._session.post(f"{self._url}/login") as response:
+            response.raise_for_status()
+            token = (await response.json())["token"]
+        self._headers = {"Authorization": f"Bearer {token}"}
+
+    async def async_get_device(self, device_id: str) -> dict[str, Any]:
+        """Return the state of one device."""
+        async with self._session.get(
+            f"{self._url}/device/{device_id}", headers=self._headers
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+
+    async def async_set_device(self, device_id: str, values: dict[str, Any]) -> None:
+        """Write values to one device."""
+        async with self._session.post(
+            f"{self._url}/device/{device_id}", headers=self._headers, json=values
+        ) as response:
+            response.raise_for_status()
@@ -2,103 +2,206 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
-from typing import TYPE_CHECKING
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.const import (
+    CONF_HOST,
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    EVENT_HOMEASSISTANT_CLOSE,
+    Platform,
+)
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 
 from .const import (
     CONF_DEVICE_ID,
     CONF_EUID,
     CONF_GATEWAY_TYPE,
+    CONF_RECORD_TRACE,
+    CONF_STALE_LIMIT,
     DOMAIN,
     GATEWAY_TYPE_IT500,
     GATEWAY_TYPE_IT600,
-    SCAN_INTERVAL,
+    STALE_LIMIT,
     SUPPORTED_PLATFORMS,
+    TRACE_DIR,
 )
-from .gateway import create_gateway
-
-if TYPE_CHECKING:
-    from .coordinator import SalusDataUpdateCoordinator
+from .commands import CommandQueue
+from .coordinator import SalusDataUpdateCoordinator
+from .gateway import IT600_SESSION_POOL, async_import_library, create_gateway
+from .handoff import async_claim_gateway
+from .scheduler import PollPhases
+from .services import async_setup_services
+from .storage import IT500TokenStore, SnapshotStore
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services and the shutdown of shared sessions."""
+    async_setup_services(hass)
+
+    async def _async_close_session_pool(_event: Event) -> None:
+        """Close the shared IT600 session when Home Assistant closes."""
+        await IT600_SESSION_POOL.async_close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session_pool)
+    return True
+
+
+def _phase_key(entry: ConfigEntry) -> str:
+    """Return the key of the gateway an entry polls.
+
+    The IT500 entries of one account share a cloud session and its batch,
+    so they share a poll phase too.
+    """
+    if entry.data.get(CONF_GATEWAY_TYPE) == GATEWAY_TYPE_IT500:
+        return f"{GATEWAY_TYPE_IT500}:{entry.data[CONF_USERNAME]}"
+    return entry.entry_id
+
+
+def _async_poll_phases(hass: HomeAssistant) -> PollPhases:
+    """Return the poll phases of the integration, reserving them on first use."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (phases := domain_data.get("poll_phases")) is None:
+        phases = domain_data["poll_phases"] = PollPhases()
+        phases.reserve(
+            _phase_key(entry) for entry in hass.config_entries.async_entries(DOMAIN)
+        )
+    return phases
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Salus Enhanced from a config entry."""
     gateway_type = entry.data[CONF_GATEWAY_TYPE]
     
+    # Reuse the gateway connected by the config flow, if it is still fresh
+    handoff = async_claim_gateway(hass, entry.unique_id)
+
+    # Import the gateway library off the event loop
+    try:
+        await async_import_library(hass, gateway_type)
+    except ImportError as err:
+        _LOGGER.error("Failed to import the %s library: %s", gateway_type, err)
+        return False
+
+    # Record the gateway's traffic to a trace file, if asked to
+    trace: dict[str, str] = {}
+    if entry.options.get(CONF_RECORD_TRACE):
+        trace["record"] = hass.config.path(TRACE_DIR, f"{entry.entry_id}.trace")
+
     # Create appropriate gateway based on type
     if gateway_type == GATEWAY_TYPE_IT600:
-        gateway = create_gateway(
-            GATEWAY_TYPE_IT600,
-            host=entry.data[CONF_HOST],
-            euid=entry.data[CONF_EUID],
-        )
+        if handoff is not None:
+            gateway = handoff.gateway
+        else:
+            gateway = create_gateway(
+                GATEWAY_TYPE_IT600,
+                host=entry.data[CONF_HOST],
+                euid=entry.data[CONF_EUID],
+                **trace,
+            )
         unique_name = entry.data[CONF_EUID]
     elif gateway_type == GATEWAY_TYPE_IT500:
+        domain_data = hass.data.setdefault(DOMAIN, {})
+        if (token_store := domain_data.get("it500_token_store")) is None:
+            token_store = domain_data["it500_token_store"] = IT500TokenStore(hass)
+        await token_store.async_load()
         gateway = create_gateway(
             GATEWAY_TYPE_IT500,
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
             device_id=entry.data[CONF_DEVICE_ID],
+            token_store=token_store,
+            **trace,
         )
         unique_name = entry.data[CONF_DEVICE_ID]
     else:
         _LOGGER.error("Unknown gateway type: %s", gateway_type)
         return False
     
-    try:
-        await gateway.connect()
-        await gateway.poll_status()
-    except Exception as err:
-        _LOGGER.error("Failed to connect to gateway: %s", err)
-        await gateway.close()
-        raise ConfigEntryNotReady(f"Failed to connect to gateway: {err}") from err
-
-    async def async_update_data():
-        """Fetch data from gateway."""
-        try:
-            return await gateway.poll_status()
-        except Exception as err:
-            raise UpdateFailed(f"Error communicating with gateway: {err}") from err
-
-    coordinator = DataUpdateCoordinator(
+    snapshot_store = SnapshotStore(hass, entry.entry_id)
+    coordinator = SalusDataUpdateCoordinator(
         hass,
-        _LOGGER,
-        name=f"{DOMAIN}_{unique_name}",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=SCAN_INTERVAL),
+        gateway,
+        gateway_type,
+        unique_name,
+        snapshot_store,
+        connected=handoff is not None,
+        stale_limit=entry.options.get(CONF_STALE_LIMIT, STALE_LIMIT),
+        phase=_async_poll_phases(hass).assign(entry.entry_id, _phase_key(entry)),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    if (snapshot := await snapshot_store.async_load()) is not None:
+        # Create entities from the last known state right away; the gateway
+        # is connected and polled in the background.
+        coordinator.async_restore(snapshot)
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh {unique_name}"
+        )
+    else:
+        # The first refresh connects to the gateway, unless it was handed over
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except ConfigEntryNotReady as err:
+            _LOGGER.error("Failed to connect to gateway: %s", err.__cause__)
+            await coordinator.async_shutdown()
+            await gateway.close()
+            _async_poll_phases(hass).release(entry.entry_id)
+            raise ConfigEntryNotReady(
+                f"Failed to connect to gateway: {err.__cause__}"
+            ) from err.__cause__
+
+    # Only set up the platforms the gateway actually has devices for; the
+    # sensor platform also holds the gateway's diagnostic sensors
+    platforms = [
+        platform
+        for platform in SUPPORTED_PLATFORMS
+        if platform == Platform.SENSOR or coordinator.data.get(platform)
+    ]
 
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN][entry.entry_id] = {
         "gateway": gateway,
         "coordinator": coordinator,
+        "commands": CommandQueue(hass, gateway, coordinator),
         "gateway_type": gateway_type,
+        "platforms": platforms,
     }
 
-    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_PLATFORMS)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
 
     return True
 
 
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload the entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(
-        entry, SUPPORTED_PLATFORMS
+        entry, hass.data[DOMAIN][entry.entry_id]["platforms"]
     )
 
     if unload_ok:
         gateway = hass.data[DOMAIN][entry.entry_id]["gateway"]
+        hass.data[DOMAIN][entry.entry_id]["commands"].async_cancel()
+        await hass.data[DOMAIN][entry.entry_id]["coordinator"].async_shutdown()
         await gateway.close()
         hass.data[DOMAIN].pop(entry.entry_id)
+        _async_poll_phases(hass).release(entry.entry_id)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the saved snapshot of a removed entry."""
+    await SnapshotStore(hass, entry.entry_id).async_remove()
@@ -0,0 +1,51 @@
+"""Support for Salus binary sensors."""
+from __future__ import annotations
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import SalusEntity
+from .models import BinarySensorState
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Salus binary sensors."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    commands = data["commands"]
+    coordinator = data["coordinator"]
+
+    async_add_entities(
+        SalusBinarySensor(coordinator, commands, device_id, device_data)
+        for device_id, device_data in coordinator.data.get("binary_sensor", {}).items()
+    )
+
+
+class SalusBinarySensor(SalusEntity, BinarySensorEntity):
+    """Representation of a Salus binary sensor."""
+
+    _category = "binary_sensor"
+    _default_name = "Salus Sensor"
+    _device: BinarySensorState
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the binary sensor is on."""
+        return self._device.is_on
+
+    @property
+    def device_class(self) -> BinarySensorDeviceClass | None:
+        """Return the device class reported by the gateway."""
+        try:
+            return BinarySensorDeviceClass(self._device.device_class)
+        except ValueError:
+            return None
@@ -0,0 +1,106 @@
+"""Capabilities of the Salus device models, built once at import."""
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any
+
+from homeassistant.components.climate import ClimateEntityFeature, HVACMode
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import CLIMATE_CAPABILITIES, DEVICE_MODELS
+
+
+class UnsupportedCommand(HomeAssistantError):
+    """Error to indicate a device model cannot do what was asked."""
+
+
+@dataclass(frozen=True, slots=True)
+class ModelCapabilities:
+    """What one device model supports; name is None for unknown models."""
+
+    name: str | None = None
+    supported_features: ClimateEntityFeature = ClimateEntityFeature(0)
+    hvac_modes: tuple[HVACMode, ...] = ()
+    preset_modes: tuple[str, ...] = ()
+    min_temp: float | None = None
+    max_temp: float | None = None
+
+    def validate(
+        self,
+        hvac_mode: HVACMode | None = None,
+        preset_mode: str | None = None,
+        temperature: float | None = None,
+    ) -> None:
+        """Raise UnsupportedCommand unless the model can take these values."""
+        if hvac_mode is not None and hvac_mode not in self.hvac_modes:
+            raise UnsupportedCommand(f"HVAC mode {hvac_mode} is not supported")
+        if preset_mode is not None and preset_mode not in self.preset_modes:
+            raise UnsupportedCommand(f"Preset {preset_mode} is not supported")
+        if temperature is not None:
+            if not self.supported_features & ClimateEntityFeature.TARGET_TEMPERATURE:
+                raise UnsupportedCommand("Setting the temperature is not supported")
+            if (self.min_temp is not None and temperature < self.min_temp) or (
+                self.max_temp is not None and temperature > self.max_temp
+            ):
+                raise UnsupportedCommand(
+                    f"Temperature {temperature} is outside"
+                    f" {self.min_temp}-{self.max_temp}"
+                )
+
+
+def _climate_capabilities(
+    name: str | None, model: Mapping[str, Any], defaults: Mapping[str, Any]
+) -> ModelCapabilities:
+    """Build the capabilities of a thermostat model."""
+    spec = {**defaults, **model}
+    features = ClimateEntityFeature.TARGET_TEMPERATURE
+    if spec.get("presets"):
+        features |= ClimateEntityFeature.PRESET_MODE
+    return ModelCapabilities(
+        name=name,
+        supported_features=features,
+        hvac_modes=tuple(HVACMode(mode) for mode in spec.get("hvac_modes", ())),
+        preset_modes=tuple(spec.get("presets", ())),
+        min_temp=spec.get("min_temp"),
+        max_temp=spec.get("max_temp"),
+    )
+
+
+def _build_registry() -> tuple[
+    Mapping[tuple[str, str, str], ModelCapabilities],
+    Mapping[tuple[str, str], ModelCapabilities],
+]:
+    """Build the capabilities of every known model, and per-category defaults."""
+    models: dict[tuple[str, str, str], ModelCapabilities] = {}
+    defaults: dict[tuple[str, str], ModelCapabilities] = {}
+    for gateway_type, categories in DEVICE_MODELS.items():
+        climate_defaults = CLIMATE_CAPABILITIES.get(gateway_type, {})
+        defaults[gateway_type, "climate"] = _climate_capabilities(
+            None, {}, climate_defaults
+        )
+        for category, category_models in categories.items():
+            for model, spec in category_models.items():
+                if category == "climate":
+                    capabilities = _climate_capabilities(
+                        spec["name"], spec, climate_defaults
+                    )
+                else:
+                    capabilities = ModelCapabilities(name=spec["name"])
+                models[gateway_type, category, model] = capabilities
+    return MappingProxyType(models), MappingProxyType(defaults)
+
+
+MODEL_CAPABILITIES, _CATEGORY_DEFAULTS = _build_registry()
+_UNKNOWN = ModelCapabilities()
+
+
+def get_capabilities(
+    gateway_type: str, category: str, model: str | None
+) -> ModelCapabilities:
+    """Return the capabilities of a model, or the defaults of its category."""
+    capabilities = MODEL_CAPABILITIES.get((gateway_type, category, model))
+    if capabilities is None:
+        capabilities = _CATEGORY_DEFAULTS.get((gateway_type, category), _UNKNOWN)
+    return capabilities
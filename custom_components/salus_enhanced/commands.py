@@ -0,0 +1,221 @@
+"""Debounced command queue for Salus devices."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import COMMAND_DEBOUNCE_DELAY
+from .gateway import SalusGatewayBase
+
+if TYPE_CHECKING:
+    from .coordinator import SalusDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Command kinds; a newer command replaces a pending one of the same kind
+KIND_TEMPERATURE = "temperature"
+KIND_HVAC_MODE = "hvac_mode"
+KIND_PRESET = "preset"
+KIND_SWITCH = "switch"
+KIND_COVER = "cover"
+
+# A gateway method and its arguments after the device id
+GatewayCall = tuple[Callable[..., Awaitable[None]], tuple[Any, ...]]
+
+
+class _PendingCommand:
+    """A command waiting for its device's debounce window to close."""
+
+    __slots__ = ("method", "args", "future")
+
+    def __init__(
+        self,
+        method: Callable[..., Awaitable[None]],
+        args: tuple[Any, ...],
+        future: asyncio.Future[None],
+    ) -> None:
+        """Initialize the command."""
+        self.method = method
+        self.args = args
+        self.future = future
+
+
+class CommandQueue:
+    """Per-device write queue in front of a gateway.
+
+    Commands of the same kind sent to a device within ``delay`` seconds of
+    each other are coalesced (last write wins) into a single gateway call.
+    Every caller of a coalesced command waits for, and gets the outcome of,
+    the command that is actually sent. The commands of a device are started
+    together, in the order they were queued, so a gateway that batches
+    writes can merge them into one request. Sent commands switch the
+    coordinator to fast polling, which confirms the optimistic state instead
+    of a full re-poll after every command.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        gateway: SalusGatewayBase,
+        coordinator: SalusDataUpdateCoordinator,
+        delay: float = COMMAND_DEBOUNCE_DELAY,
+    ) -> None:
+        """Initialize the queue."""
+        self._hass = hass
+        self._gateway = gateway
+        self._coordinator = coordinator
+        self._delay = delay
+        self._pending: dict[str, dict[str, _PendingCommand]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self.sent_count = 0
+        self.coalesced_count = 0
+
+    async def async_send(
+        self,
+        device_id: str,
+        kind: str,
+        method: Callable[..., Awaitable[None]],
+        *args: Any,
+    ) -> None:
+        """Queue ``method(device_id, *args)`` and wait until it was sent."""
+        commands = self._pending.setdefault(device_id, {})
+        if (command := commands.get(kind)) is not None:
+            command.method = method
+            command.args = args
+            self.coalesced_count += 1
+        else:
+            command = commands[kind] = _PendingCommand(
+                method, args, self._hass.loop.create_future()
+            )
+
+        if (timer := self._timers.pop(device_id, None)) is not None:
+            timer.cancel()
+        self._timers[device_id] = self._hass.loop.call_later(
+            self._delay, self._async_start_flush, device_id
+        )
+
+        await asyncio.shield(command.future)
+
+    @callback
+    def _async_start_flush(self, device_id: str) -> None:
+        """Send the pending commands of a device once its window closed."""
+        self._timers.pop(device_id, None)
+        commands = self._pending.pop(device_id, {})
+        self._hass.async_create_background_task(
+            self._async_flush(device_id, commands),
+            f"salus_enhanced command flush {device_id}",
+        )
+
+    async def _async_flush(
+        self, device_id: str, commands: dict[str, _PendingCommand]
+    ) -> None:
+        """Send the pending commands of a device."""
+        results = await asyncio.gather(
+            *(
+                command.method(device_id, *command.args)
+                for command in commands.values()
+            ),
+            return_exceptions=True,
+        )
+        for (kind, command), result in zip(commands.items(), results):
+            if isinstance(result, BaseException):
+                _LOGGER.debug("%s command for %s failed: %s", kind, device_id, result)
+                command.future.set_exception(result)
+            else:
+                self.sent_count += 1
+                command.future.set_result(None)
+        self._coordinator.async_command_sent()
+
+    async def async_send_many(
+        self,
+        commands: dict[str, list[GatewayCall]],
+        limit: int,
+    ) -> dict[str, BaseException | None]:
+        """Send commands to many devices, at most ``limit`` devices at a time.
+
+        Each device's ``(method, args)`` commands are started together, in
+        order, so they can be merged like those of async_send. Unlike
+        async_send they are sent right away and leave the poll schedule
+        alone; the caller refreshes once at the end. Returns the error of
+        each device, or None if all its commands went through.
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def send(device_id: str, device_commands: list[GatewayCall]) -> None:
+            async with semaphore:
+                results = await asyncio.gather(
+                    *(method(device_id, *args) for method, args in device_commands),
+                    return_exceptions=True,
+                )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+                self.sent_count += 1
+
+        results = await asyncio.gather(
+            *(send(device_id, items) for device_id, items in commands.items()),
+            return_exceptions=True,
+        )
+        return dict(zip(commands, results))
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop all pending commands."""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for commands in self._pending.values():
+            for command in commands.values():
+                command.future.cancel()
+        self._pending.clear()
+
+    async def async_set_temperature(self, device_id: str, temperature: float) -> None:
+        """Set climate device temperature."""
+        await self.async_send(
+            device_id,
+            KIND_TEMPERATURE,
+            self._gateway.set_climate_device_temperature,
+            temperature,
+        )
+
+    async def async_set_hvac_mode(self, device_id: str, mode: str) -> None:
+        """Set climate device mode."""
+        await self.async_send(
+            device_id, KIND_HVAC_MODE, self._gateway.set_climate_device_mode, mode
+        )
+
+    async def async_set_preset(self, device_id: str, preset: str) -> None:
+        """Set climate device preset."""
+        await self.async_send(
+            device_id, KIND_PRESET, self._gateway.set_climate_device_preset, preset
+        )
+
+    async def async_turn_on_switch(self, device_id: str) -> None:
+        """Turn on switch device."""
+        await self.async_send(
+            device_id, KIND_SWITCH, self._gateway.turn_on_switch_device
+        )
+
+    async def async_turn_off_switch(self, device_id: str) -> None:
+        """Turn off switch device."""
+        await self.async_send(
+            device_id, KIND_SWITCH, self._gateway.turn_off_switch_device
+        )
+
+    async def async_open_cover(self, device_id: str) -> None:
+        """Open cover device."""
+        await self.async_send(device_id, KIND_COVER, self._gateway.open_cover_device)
+
+    async def async_close_cover(self, device_id: str) -> None:
+        """Close cover device."""
+        await self.async_send(device_id, KIND_COVER, self._gateway.close_cover_device)
+
+    async def async_set_cover_position(self, device_id: str, position: int) -> None:
+        """Set cover position."""
+        await self.async_send(
+            device_id, KIND_COVER, self._gateway.set_cover_position, position
+        )
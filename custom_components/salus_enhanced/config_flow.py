@@ -8,7 +8,7 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.exceptions import HomeAssistantError
 
@@ -16,10 +16,15 @@ from .const import (
     CONF_DEVICE_ID,
     CONF_EUID,
     CONF_GATEWAY_TYPE,
+    CONF_RECORD_TRACE,
+    CONF_STALE_LIMIT,
     DOMAIN,
     GATEWAY_TYPE_IT500,
     GATEWAY_TYPE_IT600,
+    STALE_LIMIT,
 )
+from .discovery import DiscoveredGateway, async_discover_gateways
+from .handoff import async_stash_gateway
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +46,9 @@ STEP_IT600_SCHEMA = vol.Schema(
     }
 )
 
+# Choice of the discovery step that falls back to the manual form
+MANUAL_ENTRY = "manual"
+
 STEP_IT500_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_USERNAME): str,
@@ -62,10 +70,17 @@ class InvalidDeviceId(HomeAssistantError):
     
 
 async def validate_it600(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
-    """Validate IT600 gateway connection."""
+    """Validate IT600 gateway connection.
+
+    Only the connect handshake is made, which does not read the details of
+    every device. The connected gateway is returned so entry setup can
+    reuse it.
+    """
     # importăm gateway lazy, ca să nu stricăm importul config_flow dacă lipsesc librăriile
     try:
-        from .gateway import create_gateway
+        from .gateway import async_import_library, create_gateway
+
+        await async_import_library(hass, GATEWAY_TYPE_IT600)
     except Exception as err:  # ModuleNotFoundError, ImportError etc.
         _LOGGER.error("Failed to import gateway module for IT600: %s", err)
         raise CannotConnect from err
@@ -78,13 +93,15 @@ async def validate_it600(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
 
     try:
         await gateway.connect()
-        await gateway.poll_status()
-        await gateway.close()
     except Exception as err:
         _LOGGER.error("Failed to connect to IT600 gateway: %s", err)
+        await gateway.close()
         raise CannotConnect from err
 
-    return {"title": f"Salus IT600 Gateway {data[CONF_EUID]}"}
+    return {
+        "title": f"Salus IT600 Gateway {data[CONF_EUID]}",
+        "gateway": gateway,
+    }
 
 
 async def validate_it500(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
@@ -114,6 +131,15 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self) -> None:
         """Initialize config flow."""
         self._gateway_type: str | None = None
+        self._discovered: dict[str, DiscoveredGateway] = {}
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> OptionsFlowHandler:
+        """Return the options flow."""
+        return OptionsFlowHandler()
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -123,7 +149,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self._gateway_type = user_input[CONF_GATEWAY_TYPE]
 
             if self._gateway_type == GATEWAY_TYPE_IT600:
-                return await self.async_step_it600()
+                return await self.async_step_it600_discovery()
             if self._gateway_type == GATEWAY_TYPE_IT500:
                 return await self.async_step_it500()
 
@@ -132,6 +158,39 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=STEP_GATEWAY_TYPE_SCHEMA,
         )
 
+    async def async_step_it600_discovery(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Offer the IT600 gateways found on the LAN."""
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            if host == MANUAL_ENTRY:
+                return await self.async_step_it600()
+            gateway = self._discovered[host]
+            return await self.async_step_it600(
+                {CONF_HOST: gateway.host, CONF_EUID: gateway.euid}
+            )
+
+        configured = {
+            entry.data.get(CONF_HOST) for entry in self._async_current_entries()
+        }
+        self._discovered = {
+            gateway.host: gateway
+            for gateway in await async_discover_gateways(self.hass)
+            if gateway.host not in configured
+        }
+        if not self._discovered:
+            return await self.async_step_it600()
+
+        hosts = {
+            host: f"{host} ({gateway.mac})" for host, gateway in self._discovered.items()
+        }
+        hosts[MANUAL_ENTRY] = "Enter manually"
+        return self.async_show_form(
+            step_id="it600_discovery",
+            data_schema=vol.Schema({vol.Required(CONF_HOST): vol.In(hosts)}),
+        )
+
     async def async_step_it600(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -139,6 +198,9 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            # Check for a duplicate before opening a connection
+            await self.async_set_unique_id(f"it600_{user_input[CONF_EUID]}")
+            self._abort_if_unique_id_configured()
             try:
                 info = await validate_it600(self.hass, user_input)
             except CannotConnect:
@@ -148,8 +210,7 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 errors["base"] = "unknown"
             else:
                 user_input[CONF_GATEWAY_TYPE] = GATEWAY_TYPE_IT600
-                await self.async_set_unique_id(f"it600_{user_input[CONF_EUID]}")
-                self._abort_if_unique_id_configured()
+                async_stash_gateway(self.hass, self.unique_id, info["gateway"])
                 return self.async_create_entry(
                     title=info["title"],
                     data=user_input,
@@ -197,3 +258,34 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 "info": "Login to https://salus-it500.com and find Device ID in the URL (devId parameter)."
             },
         )
+
+
+class OptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle the options of a Salus Enhanced entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Set how long entities keep showing data from a lost gateway.
+
+        Also turns the recording of a trace of the gateway's traffic on or off.
+        """
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        stale_limit = options.get(CONF_STALE_LIMIT, STALE_LIMIT)
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_STALE_LIMIT, default=stale_limit): vol.All(
+                        vol.Coerce(int), vol.Range(min=0, max=86400)
+                    ),
+                    vol.Required(
+                        CONF_RECORD_TRACE,
+                        default=options.get(CONF_RECORD_TRACE, False),
+                    ): bool,
+                }
+            ),
+        )
@@ -14,6 +14,153 @@ GATEWAY_TYPE_IT500 = "it500"
 
 SCAN_INTERVAL = 30
 
+# Adaptive polling (seconds): floor, baseline and ceiling per gateway type
+POLL_INTERVALS = {
+    GATEWAY_TYPE_IT600: {
+        "min_interval": 5,
+        "base_interval": SCAN_INTERVAL,
+        "max_interval": 300,
+    },
+    GATEWAY_TYPE_IT500: {
+        "min_interval": 30,
+        "base_interval": 60,
+        "max_interval": 900,
+    },
+}
+
+# Poll at the floor interval for this long after a command or a fresh change
+FAST_POLL_WINDOW = 60
+
+# Number of recent polls kept to estimate the change rate
+POLL_HISTORY = 10
+
+# Gateways poll at their own phase of the interval, plus random jitter of
+# up to this share of the interval, capped at POLL_JITTER_MAX seconds
+POLL_JITTER = 0.02
+POLL_JITTER_MAX = 2.0
+
+# IT600: HTTP connections kept per gateway host by the shared session, and
+# how long idle ones stay open (seconds)
+IT600_CONNECTIONS_PER_HOST = 2
+IT600_KEEPALIVE_TIMEOUT = 30
+
+# IT600: seconds to wait for a gateway response, and the response size
+# (bytes) and device count from which decryption, parsing and building the
+# snapshot run in the executor instead of on the event loop
+IT600_REQUEST_TIMEOUT = 5
+IT600_OFFLOAD_SIZE = 32768
+IT600_OFFLOAD_DEVICES = 100
+
+# IT600 poll tiers: seconds between refreshes of each part of the snapshot,
+# 0 meaning every poll. The inventory is the device list (readall) and the
+# gateway record; every category is refreshed along with it, since the
+# devices each category reads come from it.
+IT600_POLL_TIERS = {
+    "inventory": 600,
+    "climate": 0,
+    "binary_sensor": 0,
+    "switch": 0,
+    "cover": 0,
+    "sensor": 120,
+}
+
+# IT500 cloud: how long the results of one batch are reused by the other
+# entries of the account
+IT500_BATCH_MAX_AGE = 10
+
+# IT500 cloud: reconnects of the entries of an account within this many
+# seconds of a successful login reuse it instead of logging in again
+IT500_RELOGIN_REUSE = 30
+
+# Every salus-it500.com request of the process goes through one queue:
+# requests per second and burst of its token bucket, requests in flight,
+# the lowest rate throttling can slow it to, the pause after a throttling
+# response without Retry-After (seconds), and retries of a throttled request
+IT500_REQUEST_RATE = 2.0
+IT500_REQUEST_BURST = 10
+IT500_MAX_CONCURRENCY = 4
+IT500_MIN_REQUEST_RATE = 0.2
+IT500_THROTTLE_PAUSE = 30
+IT500_THROTTLE_RETRIES = 1
+
+# Priorities of IT500 requests in that queue, most urgent first
+IT500_PRIORITY_LOGIN = 0
+IT500_PRIORITY_WRITE = 1
+IT500_PRIORITY_CONFIRM = 2
+IT500_PRIORITY_POLL = 3
+
+# Writes to one IT500 device within this many seconds of the first are
+# merged into a single cloud request
+IT500_WRITE_WINDOW = 0.3
+
+# Saved IT500 session tokens are reused for at most this many seconds
+IT500_TOKEN_LIFETIME = 12 * 3600
+
+# LAN discovery of IT600 gateways: port, EUID tried, parallel probes,
+# per-host timeouts (seconds) and how long results are reused
+IT600_PORT = 80
+IT600_DEFAULT_EUID = "0000000000000000"
+DISCOVERY_CONCURRENCY = 64
+DISCOVERY_CONNECT_TIMEOUT = 0.5
+DISCOVERY_IDENTIFY_TIMEOUT = 2
+DISCOVERY_CACHE_TTL = 300
+
+# A gateway connected by the config flow is handed to entry setup if the
+# entry is set up within this many seconds, and closed otherwise
+GATEWAY_HANDOFF_TTL = 60
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+SNAPSHOT_SAVE_DELAY = 60
+
+# Commands of the same kind sent to a device within this window are coalesced
+COMMAND_DEBOUNCE_DELAY = 1.0
+
+# bulk_set service: device writes in flight at once per gateway
+SERVICE_BULK_SET = "bulk_set"
+BULK_CONCURRENCY = {
+    GATEWAY_TYPE_IT600: 4,
+    GATEWAY_TYPE_IT500: 2,
+}
+
+# Entities keep showing the last good data for this many seconds after
+# polls start failing (overridable in the entry options)
+CONF_STALE_LIMIT = "stale_limit"
+STALE_LIMIT = 900
+
+# Background reconnects back off from the minimum to the maximum delay
+# (seconds), with this much random jitter either way
+RECONNECT_BACKOFF_MIN = 5
+RECONNECT_BACKOFF_MAX = 300
+RECONNECT_JITTER = 0.2
+
+# After this many failures in a row the circuit opens and the gateway is
+# left alone for CIRCUIT_OPEN_TIME seconds before a single trial connect
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_OPEN_TIME = 600
+
+# Thermostat history kept in memory for the trend attributes: samples per
+# device, how far back they go (seconds), and the span needed before
+# trends are reported
+HISTORY_SIZE = 240
+HISTORY_WINDOW = 3600
+HISTORY_MIN_SPAN = 300
+
+# Poll results and commands are appended to a trace file under this folder
+# of the config directory when the entry option is set; traces can be
+# replayed with create_gateway(replay=...)
+CONF_RECORD_TRACE = "record_trace"
+TRACE_DIR = "salus_enhanced_traces"
+TRACE_VERSION = 1
+
+# Number of recent polls the poll-cycle percentiles are computed over
+METRICS_WINDOW = 100
+
+# Commanded values are shown right away and rolled back if no poll confirms
+# them within this many seconds
+OPTIMISTIC_TIMEOUT = 90
+
 SUPPORTED_PLATFORMS = [
     Platform.CLIMATE,
     Platform.BINARY_SENSOR,
@@ -34,7 +181,18 @@ IT600_DEVICE_MODELS = {
         "VS20BRF": {"name": "Salus VS20 Black Thermostat"},
         "SQ610": {"name": "Salus SQ610 Thermostat"},
         "SQ610RF": {"name": "Salus SQ610RF Thermostat"},
-        "FC600": {"name": "Salus FC600 Fan Coil Thermostat"},
+        "FC600": {
+            "name": "Salus FC600 Fan Coil Thermostat",
+            "hvac_modes": ["heat", "cool", "auto"],
+            "presets": [
+                "Follow Schedule",
+                "Permanent Hold",
+                "Temporary Hold",
+                "Eco",
+                "Off",
+            ],
+            "max_temp": 40,
+        },
     },
     "binary_sensor": {
         "SW600": {"name": "Salus SW600 Window Sensor"},
@@ -77,6 +235,23 @@ DEVICE_MODELS = {
     GATEWAY_TYPE_IT500: IT500_DEVICE_MODELS,
 }
 
+# Thermostat capabilities of each gateway type, unless the model entry
+# above overrides them; presets are the values the gateway library uses
+CLIMATE_CAPABILITIES = {
+    GATEWAY_TYPE_IT600: {
+        "hvac_modes": ["heat", "auto", "off"],
+        "presets": ["Follow Schedule", "Permanent Hold", "Off"],
+        "min_temp": 5,
+        "max_temp": 35,
+    },
+    GATEWAY_TYPE_IT500: {
+        "hvac_modes": ["heat", "auto", "off"],
+        "presets": ["auto", "manual"],
+        "min_temp": 5,
+        "max_temp": 35,
+    },
+}
+
 # Attribute mappings for better entity support
 ATTR_BATTERY = "battery"
 ATTR_SIGNAL = "signal_strength"
@@ -84,3 +259,9 @@ ATTR_HUMIDITY = "humidity"
 ATTR_VALVE_POSITION = "valve_position"
 ATTR_WINDOW_OPEN = "window_open"
 ATTR_HEATING_DEMAND = "heating_demand"
+ATTR_PENDING = "pending"
+ATTR_RESTORED = "restored"
+ATTR_STALE_AGE = "stale_age"
+ATTR_HEATING_RATE = "heating_rate"
+ATTR_TIME_TO_SETPOINT = "time_to_setpoint"
+ATTR_DUTY_CYCLE = "duty_cycle"
@@ -0,0 +1,470 @@
+"""Data update coordinator for Salus Enhanced."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DOMAIN,
+    OPTIMISTIC_TIMEOUT,
+    POLL_INTERVALS,
+    POLL_JITTER,
+    POLL_JITTER_MAX,
+    STALE_LIMIT,
+)
+from .gateway import SalusGatewayBase
+from .history import ClimateHistory
+from .metrics import PollMetrics
+from .models import DeviceState
+from .resilience import GatewaySession, GatewayUnavailable
+from .scheduler import AdaptivePollScheduler
+from .storage import SnapshotStore
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def diff_snapshots(
+    previous: dict[str, dict[str, Any]] | None,
+    current: dict[str, dict[str, Any]],
+) -> dict[str, set[str]]:
+    """Return the device ids that changed between two snapshots, per category."""
+    changed: dict[str, set[str]] = {}
+    previous = previous or {}
+
+    for category in previous.keys() | current.keys():
+        old_devices = previous.get(category) or {}
+        new_devices = current.get(category) or {}
+        ids = {
+            device_id
+            for device_id in old_devices.keys() | new_devices.keys()
+            if old_devices.get(device_id) != new_devices.get(device_id)
+        }
+        if ids:
+            changed[category] = ids
+
+    return changed
+
+
+class _PendingState:
+    """Commanded field values not yet confirmed by a poll."""
+
+    __slots__ = ("fields", "original", "actual", "deadline", "cancel_expiry")
+
+    def __init__(self, actual: DeviceState) -> None:
+        """Initialize the pending state."""
+        self.fields: dict[str, Any] = {}
+        self.original: dict[str, Any] = {}
+        self.actual = actual
+        self.deadline = 0.0
+        self.cancel_expiry: Callable[[], None] | None = None
+
+
+class SalusDataUpdateCoordinator(DataUpdateCoordinator[dict[str, dict[str, Any]]]):
+    """Coordinator that only notifies entities whose device changed.
+
+    Entities register with a ``(category, device_id)`` context. After each
+    poll the new snapshot is compared with the previous one and only the
+    listeners of changed devices are called back. Listeners without a
+    context, and every listener on an availability transition, are always
+    called.
+
+    The poll interval is picked by an AdaptivePollScheduler after every
+    poll and every command, and every poll is timed into ``metrics``.
+    Only one poll runs at a time: refreshes requested while a poll is in
+    flight wait for a single follow-up poll, which sees any command sent in
+    the meantime, instead of each polling the gateway. With a ``phase``
+    (0 to 1) scheduled polls only start that share of the interval, plus a
+    little jitter, after setup, so gateways with different phases do not
+    poll together.
+    Thermostat readings are added to a ClimateHistory per device, and
+    devices whose trend attributes changed are updated as well.
+
+    Commanded values can be applied optimistically with async_set_pending.
+    They are overlaid on every poll until the device reports them, until the
+    device reports a third value (changed elsewhere), or until
+    OPTIMISTIC_TIMEOUT passes, after which the polled value is restored.
+
+    The gateway is connected by the first poll, unless it is handed over
+    already connected, and reconnected in the background by its
+    GatewaySession when polls fail. Until then entities keep the last good
+    data, marked stale, for up to ``stale_limit`` seconds; only after that
+    do they become unavailable. With a snapshot store, every changed snapshot is
+    saved, and a saved snapshot can be shown with async_restore while the
+    gateway is still being connected.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        gateway: SalusGatewayBase,
+        gateway_type: str,
+        unique_name: str,
+        snapshot_store: SnapshotStore | None = None,
+        connected: bool = False,
+        stale_limit: float = STALE_LIMIT,
+        phase: float | None = None,
+    ) -> None:
+        """Initialize the coordinator."""
+        self.scheduler = AdaptivePollScheduler(**POLL_INTERVALS[gateway_type])
+        self.metrics = PollMetrics()
+        # with a phase, scheduled polls only start once it is reached
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"{DOMAIN}_{unique_name}",
+            update_interval=(
+                self.scheduler.current_interval if phase is None else None
+            ),
+        )
+        self.gateway = gateway
+        self.gateway_type = gateway_type
+        self.restored = False
+        self.session = GatewaySession(
+            hass, gateway, self.name, connected, self._async_reconnected
+        )
+        self.stale_limit = stale_limit
+        self.phase = phase
+        self.stale = False
+        self.last_good: float | None = None
+        self._snapshot_store = snapshot_store
+        self.changed_devices: dict[str, set[str]] | None = None
+        self.changed_count = 0
+        self._notified_success: bool | None = None
+        self._pending: dict[tuple[str, str], _PendingState] = {}
+        self.history: dict[str, ClimateHistory] = {}
+        self.trends: dict[str, dict[str, Any]] = {}
+        self._polling = False
+        self._follow_up: asyncio.Future[None] | None = None
+        self._cancel_phase: Callable[[], None] | None = None
+        if phase is not None:
+            interval = self.scheduler.current_interval.total_seconds()
+            self._cancel_phase = async_call_later(
+                hass,
+                phase * interval
+                + random.uniform(0, min(interval * POLL_JITTER, POLL_JITTER_MAX)),
+                self._async_start_phase,
+            )
+        gateway.set_update_callback(self.async_set_updated_data)
+
+    @callback
+    def _async_start_phase(self, _now: datetime) -> None:
+        """Start scheduled polls once the gateway's phase is reached."""
+        self._cancel_phase = None
+        self.update_interval = self.scheduler.current_interval
+        if self._listeners:
+            self._schedule_refresh()
+
+    def _set_interval(self, interval: timedelta) -> None:
+        """Use a new poll interval, unless scheduled polls wait for the phase."""
+        if self._cancel_phase is None:
+            self.update_interval = interval
+
+    async def _async_refresh(
+        self,
+        log_failures: bool = True,
+        raise_on_auth_failed: bool = False,
+        scheduled: bool = False,
+        raise_on_entry_error: bool = False,
+    ) -> None:
+        """Refresh data, or wait for the follow-up of the poll in flight."""
+        if self._polling:
+            self.metrics.record_refresh(joined=True)
+            if self._follow_up is None:
+                self._follow_up = self.hass.loop.create_future()
+            # shielded: a cancelled caller must not cancel the other waiters
+            await asyncio.shield(self._follow_up)
+            return
+
+        self._polling = True
+        try:
+            self.metrics.record_refresh(joined=False)
+            await super()._async_refresh(
+                log_failures, raise_on_auth_failed, scheduled, raise_on_entry_error
+            )
+            # the poll may have read the gateway before the commands of the
+            # callers that joined it, so poll once more for all of them
+            while (follow_up := self._follow_up) is not None:
+                self._follow_up = None
+                try:
+                    self.metrics.record_refresh(joined=False)
+                    await super()._async_refresh(log_failures)
+                finally:
+                    follow_up.set_result(None)
+        finally:
+            self._polling = False
+            if (follow_up := self._follow_up) is not None:
+                # the poll failed or was cancelled before its follow-up ran
+                self._follow_up = None
+                follow_up.set_result(None)
+
+    async def _async_update_data(self) -> dict[str, dict[str, Any]]:
+        """Fetch data from gateway and record which devices changed."""
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        try:
+            data = await self.session.async_poll()
+        except Exception as err:
+            if not isinstance(err, GatewayUnavailable):
+                self.metrics.record_error(err)
+            self._set_interval(self.scheduler.record_error())
+            return self._keep_stale_data(err)
+        if self.session.last_connect_time is not None:
+            timings["connect"] = self.session.last_connect_time
+        timings["total"] = time.perf_counter() - started
+
+        data = self._process_snapshot(data)
+        stats = self.gateway.last_poll_stats
+        for phase in ("request", "parse", "normalize", "loop"):
+            if phase in stats:
+                timings[phase] = stats[phase]
+        self.metrics.record_poll(
+            timings,
+            stats.get("payload_size"),
+            sum(len(devices) for devices in data.values()),
+            self.changed_count,
+        )
+        return data
+
+    def _keep_stale_data(self, err: Exception) -> dict[str, dict[str, Any]]:
+        """Return the last good data after a failed poll, if recent enough."""
+        age = self.data_age
+        if self.data is None or age is None or age > self.stale_limit:
+            raise UpdateFailed(f"Error communicating with gateway: {err}") from err
+
+        _LOGGER.debug(
+            "%s: poll failed (%s), keeping data from %.0f s ago", self.name, err, age
+        )
+        self.stale = True
+        # update every entity so they show the age of their data
+        self.changed_devices = None
+        self.changed_count = 0
+        return self.data
+
+    @property
+    def data_age(self) -> float | None:
+        """Return the seconds since the data was last fetched or restored."""
+        if self.last_good is None:
+            return None
+        return time.monotonic() - self.last_good
+
+    @callback
+    def _async_reconnected(self) -> None:
+        """Poll right away once the gateway is reachable again."""
+        self.hass.async_create_task(self.async_request_refresh())
+
+    def _process_snapshot(
+        self, data: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """Apply pending values, record changes and pick the next interval."""
+        self.last_good = time.monotonic()
+        self.stale = False
+        settled: list[tuple[str, str]] = []
+        # save what the gateway reported, not the commanded values shown
+        polled = data
+        if self._pending:
+            data = self._reconcile_pending(data, settled)
+
+        first_poll = self.data is None or self.restored
+        self._record_changes(data)
+        if settled and self.changed_devices is not None:
+            # the pending flag cleared even if the values did not change
+            for category, device_id in settled:
+                self.changed_devices.setdefault(category, set()).add(device_id)
+
+        if self.restored:
+            # live data replaces the restored snapshot: update every entity
+            self.restored = False
+            self.changed_devices = None
+
+        self._record_history(data.get("climate") or {})
+
+        if self._snapshot_store is not None and (first_poll or self.changed_count):
+            self._snapshot_store.async_schedule_save(polled)
+
+        self._set_interval(
+            self.scheduler.record_poll(0 if first_poll else self.changed_count)
+        )
+        return data
+
+    @callback
+    def async_restore(self, data: dict[str, dict[str, Any]]) -> None:
+        """Show a saved snapshot until the first live poll."""
+        self.data = data
+        self.restored = True
+        self.last_good = time.monotonic()
+
+    @callback
+    def async_command_sent(self) -> None:
+        """Switch to fast polling after a command was sent to a device."""
+        self._set_interval(self.scheduler.record_command())
+        if self._listeners and self.update_interval is not None:
+            self._schedule_refresh()
+
+    @callback
+    def async_set_pending(self, category: str, device_id: str, **fields: Any) -> None:
+        """Show commanded values right away, until a poll confirms them."""
+        devices = self.data.get(category, {}) if self.data else {}
+        if (device := devices.get(device_id)) is None:
+            return
+
+        key = (category, device_id)
+        if (pending := self._pending.get(key)) is None:
+            pending = self._pending[key] = _PendingState(device)
+        for name, value in fields.items():
+            pending.original.setdefault(name, getattr(pending.actual, name))
+            pending.fields[name] = value
+
+        pending.deadline = time.monotonic() + OPTIMISTIC_TIMEOUT
+        if pending.cancel_expiry is not None:
+            pending.cancel_expiry()
+        pending.cancel_expiry = async_call_later(
+            self.hass, OPTIMISTIC_TIMEOUT, partial(self._async_expire_pending, key)
+        )
+        self._async_publish(category, device_id, pending.actual.replace(**pending.fields))
+
+    @callback
+    def async_clear_pending(self, category: str, device_id: str) -> None:
+        """Drop commanded values and show the last polled state again."""
+        if (pending := self._pop_pending((category, device_id))) is not None:
+            self._async_publish(category, device_id, pending.actual)
+
+    def is_pending(self, category: str, device_id: str) -> bool:
+        """Return True if the device shows values not yet confirmed."""
+        return (category, device_id) in self._pending
+
+    @callback
+    def _async_expire_pending(self, key: tuple[str, str], _now: datetime) -> None:
+        """Roll back commanded values that no poll confirmed in time."""
+        self._pending[key].cancel_expiry = None
+        _LOGGER.debug("%s: optimistic state of %s timed out", self.name, key[1])
+        self.async_clear_pending(*key)
+
+    def _pop_pending(self, key: tuple[str, str]) -> _PendingState | None:
+        """Remove and return the pending state of a device."""
+        pending = self._pending.pop(key, None)
+        if pending is not None and pending.cancel_expiry is not None:
+            pending.cancel_expiry()
+        return pending
+
+    @callback
+    def _async_publish(self, category: str, device_id: str, device: DeviceState) -> None:
+        """Replace the record of one device and notify its entities."""
+        self.data = {
+            **self.data,
+            category: {**self.data.get(category, {}), device_id: device},
+        }
+        self.changed_devices = {category: {device_id}}
+        self.async_update_listeners()
+
+    def _reconcile_pending(
+        self, data: dict[str, dict[str, Any]], settled: list[tuple[str, str]]
+    ) -> dict[str, dict[str, Any]]:
+        """Overlay still-pending commanded values on a fresh snapshot.
+
+        Devices whose pending state is dropped are appended to ``settled``.
+        """
+        now = time.monotonic()
+        for key, pending in list(self._pending.items()):
+            category, device_id = key
+            devices = data.get(category) or {}
+            if (actual := devices.get(device_id)) is None or now >= pending.deadline:
+                self._pop_pending(key)
+                settled.append(key)
+                continue
+
+            pending.actual = actual
+            for name, value in list(pending.fields.items()):
+                reported = getattr(actual, name)
+                if reported == value or reported != pending.original[name]:
+                    # confirmed, or changed to something else on the device
+                    del pending.fields[name]
+
+            if not pending.fields:
+                self._pop_pending(key)
+                settled.append(key)
+                continue
+
+            data = {
+                **data,
+                category: {**devices, device_id: actual.replace(**pending.fields)},
+            }
+        return data
+
+    async def async_shutdown(self) -> None:
+        """Cancel reconnects, pending rollbacks and scheduled refreshes."""
+        self.session.async_cancel()
+        if self._cancel_phase is not None:
+            self._cancel_phase()
+            self._cancel_phase = None
+        for key in list(self._pending):
+            self._pop_pending(key)
+        await super().async_shutdown()
+
+    @callback
+    def async_set_updated_data(self, data: dict[str, dict[str, Any]]) -> None:
+        """Take a snapshot fetched outside a poll, e.g. by a shared session."""
+        super().async_set_updated_data(self._process_snapshot(data))
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners of changed devices."""
+        changed = self.changed_devices
+        if changed is None or self._notified_success != self.last_update_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
+            return
+
+        for update_callback, context in list(self._listeners.values()):
+            if context is None:
+                update_callback()
+                continue
+            category, device_id = context
+            if device_id in changed.get(category, ()):
+                update_callback()
+
+    def _record_history(self, devices: dict[str, Any]) -> None:
+        """Add the thermostat readings of a poll to their history."""
+        now = time.monotonic()
+        for device_id in self.history.keys() - devices.keys():
+            del self.history[device_id]
+            self.trends.pop(device_id, None)
+
+        for device_id, device in devices.items():
+            if device.current_temperature is None:
+                continue
+            if (history := self.history.get(device_id)) is None:
+                history = self.history[device_id] = ClimateHistory()
+            history.add(
+                now,
+                device.current_temperature,
+                device.target_temperature,
+                device.is_heating,
+            )
+            trends = history.trends()
+            if trends != self.trends.get(device_id, {}):
+                self.trends[device_id] = trends
+                if self.changed_devices is not None:
+                    self.changed_devices.setdefault("climate", set()).add(device_id)
+
+    def _record_changes(self, data: dict[str, dict[str, Any]]) -> None:
+        """Diff a new snapshot against the current one."""
+        if self.data is None:
+            self.changed_devices = None
+            self.changed_count = sum(len(devices) for devices in data.values())
+        else:
+            self.changed_devices = diff_snapshots(self.data, data)
+            self.changed_count = sum(
+                len(ids) for ids in self.changed_devices.values()
+            )
+
+        _LOGGER.debug("%s: %d device(s) changed", self.name, self.changed_count)
@@ -0,0 +1,94 @@
+"""Support for Salus covers."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.cover import (
+    ATTR_POSITION,
+    CoverDeviceClass,
+    CoverEntity,
+    CoverEntityFeature,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import SalusEntity
+from .models import CoverState
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Salus covers."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    commands = data["commands"]
+    coordinator = data["coordinator"]
+
+    async_add_entities(
+        SalusCover(coordinator, commands, device_id, device_data)
+        for device_id, device_data in coordinator.data.get("cover", {}).items()
+    )
+
+
+class SalusCover(SalusEntity, CoverEntity):
+    """Representation of a Salus shutter controller."""
+
+    _category = "cover"
+    _default_name = "Salus Cover"
+    _device: CoverState
+
+    _attr_device_class = CoverDeviceClass.SHUTTER
+    _attr_supported_features = (
+        CoverEntityFeature.OPEN
+        | CoverEntityFeature.CLOSE
+        | CoverEntityFeature.SET_POSITION
+    )
+
+    @property
+    def current_cover_position(self) -> int | None:
+        """Return the current position of the cover."""
+        return self._device.current_position
+
+    @property
+    def is_opening(self) -> bool | None:
+        """Return if the cover is opening."""
+        return self._device.is_opening
+
+    @property
+    def is_closing(self) -> bool | None:
+        """Return if the cover is closing."""
+        return self._device.is_closing
+
+    @property
+    def is_closed(self) -> bool | None:
+        """Return if the cover is closed."""
+        return self._device.is_closed
+
+    async def async_open_cover(self, **kwargs: Any) -> None:
+        """Open the cover."""
+        await self._async_send(
+            self._commands.async_open_cover(self._device_id),
+            current_position=100,
+            is_closed=False,
+        )
+
+    async def async_close_cover(self, **kwargs: Any) -> None:
+        """Close the cover."""
+        await self._async_send(
+            self._commands.async_close_cover(self._device_id),
+            current_position=0,
+            is_closed=True,
+        )
+
+    async def async_set_cover_position(self, **kwargs: Any) -> None:
+        """Move the cover to a position."""
+        position = kwargs[ATTR_POSITION]
+        await self._async_send(
+            self._commands.async_set_cover_position(self._device_id, position),
+            current_position=position,
+            is_closed=position == 0,
+        )
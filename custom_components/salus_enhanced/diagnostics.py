@@ -0,0 +1,65 @@
+"""Diagnostics support for Salus Enhanced."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import REDACTED, async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_EUID, DOMAIN, GATEWAY_TYPE_IT500
+
+# The EUID is the key of the gateway's local encryption
+TO_REDACT = {CONF_EUID, CONF_HOST, CONF_PASSWORD, CONF_USERNAME, "unique_id", "title"}
+
+
+def _redact_phase_key(key: str, slot: int) -> str:
+    """Return a poll phase key without the IT500 account's username."""
+    if key.startswith(f"{GATEWAY_TYPE_IT500}:"):
+        # slots are unique per gateway, so redacted keys stay distinct
+        return f"{GATEWAY_TYPE_IT500}:{REDACTED}:{slot}"
+    return key
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    coordinator = data["coordinator"]
+    commands = data["commands"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "poll": {
+            # the coordinator's own interval is unset until its phase is reached
+            "interval": coordinator.scheduler.current_interval.total_seconds(),
+            "consecutive_errors": coordinator.scheduler.consecutive_errors,
+            "last_update_success": coordinator.last_update_success,
+            "stale": coordinator.stale,
+            "stale_limit": coordinator.stale_limit,
+            "tiers": coordinator.gateway.poll_tiers,
+            "phase": coordinator.phase,
+            "phases": {
+                _redact_phase_key(key, gateway["slot"]): gateway
+                for key, gateway in hass.data[DOMAIN]["poll_phases"].as_dict().items()
+            },
+            **coordinator.metrics.as_dict(),
+        },
+        "connection": {
+            **coordinator.session.as_dict(),
+            **coordinator.gateway.connection_stats,
+        },
+        "request_queue": coordinator.gateway.request_queue_stats,
+        "commands": {
+            "sent": commands.sent_count,
+            "coalesced": commands.coalesced_count,
+        },
+        "devices": {
+            category: {
+                device_id: device.as_dict() for device_id, device in devices.items()
+            }
+            for category, devices in (coordinator.data or {}).items()
+        },
+    }
@@ -0,0 +1,151 @@
+"""LAN discovery of Salus IT600 (UGE600) gateways."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable
+import ipaddress
+import logging
+import time
+from typing import Any, NamedTuple
+
+import aiohttp
+
+from homeassistant.components import network
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DISCOVERY_CACHE_TTL,
+    DISCOVERY_CONCURRENCY,
+    DISCOVERY_CONNECT_TIMEOUT,
+    DISCOVERY_IDENTIFY_TIMEOUT,
+    DOMAIN,
+    GATEWAY_TYPE_IT600,
+    IT600_DEFAULT_EUID,
+    IT600_PORT,
+)
+from .gateway import IT600Gateway, async_import_library
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_DISCOVERY = "discovery"
+
+# Larger networks are only scanned in the /24 around the local address
+MAX_SCAN_PREFIX = 24
+
+
+class DiscoveredGateway(NamedTuple):
+    """An IT600 gateway that answered on the LAN."""
+
+    host: str
+    euid: str
+    mac: str
+
+
+def scan_hosts(adapters: Iterable[dict[str, Any]]) -> list[str]:
+    """Return the IPv4 hosts to scan on the enabled network adapters."""
+    hosts: dict[str, None] = {}
+    own: set[str] = set()
+    for adapter in adapters:
+        if not adapter["enabled"]:
+            continue
+        for address in adapter["ipv4"]:
+            ip = ipaddress.IPv4Address(address["address"])
+            if ip.is_loopback or ip.is_link_local:
+                continue
+            own.add(str(ip))
+            prefix = max(address["network_prefix"], MAX_SCAN_PREFIX)
+            net = ipaddress.IPv4Network(f"{ip}/{prefix}", strict=False)
+            hosts.update(dict.fromkeys(str(host) for host in net.hosts()))
+    return [host for host in hosts if host not in own]
+
+
+async def async_port_open(host: str, port: int, timeout: float) -> bool:
+    """Return True if a TCP connection to host:port opens within timeout."""
+    try:
+        async with asyncio.timeout(timeout):
+            _reader, writer = await asyncio.open_connection(host, port)
+    except (OSError, TimeoutError):
+        return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+async def async_identify_gateway(
+    session: aiohttp.ClientSession,
+    host: str,
+    port: int = IT600_PORT,
+    euid: str = IT600_DEFAULT_EUID,
+    timeout: float = DISCOVERY_IDENTIFY_TIMEOUT,
+) -> DiscoveredGateway | None:
+    """Return the gateway at host if it answers an IT600 handshake for euid."""
+    gateway = IT600Gateway(host, euid, port, session, timeout)
+    try:
+        await gateway.connect()
+    except Exception as err:  # noqa: BLE001
+        _LOGGER.debug("%s:%s is not an IT600 gateway: %s", host, port, err)
+        return None
+    finally:
+        await gateway.close()
+    return DiscoveredGateway(host, euid, gateway.mac)
+
+
+async def async_scan(
+    session: aiohttp.ClientSession,
+    hosts: Iterable[str],
+    port: int = IT600_PORT,
+    euid: str = IT600_DEFAULT_EUID,
+    concurrency: int = DISCOVERY_CONCURRENCY,
+    connect_timeout: float = DISCOVERY_CONNECT_TIMEOUT,
+    identify_timeout: float = DISCOVERY_IDENTIFY_TIMEOUT,
+) -> list[DiscoveredGateway]:
+    """Probe hosts concurrently and return the IT600 gateways found.
+
+    A cheap TCP connect with a short timeout filters the hosts first; only
+    hosts with the port open get the (slower) encrypted handshake.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def probe(host: str) -> DiscoveredGateway | None:
+        async with semaphore:
+            if not await async_port_open(host, port, connect_timeout):
+                return None
+            return await async_identify_gateway(
+                session, host, port, euid, identify_timeout
+            )
+
+    results = await asyncio.gather(*(probe(host) for host in hosts))
+    return [gateway for gateway in results if gateway is not None]
+
+
+async def async_discover_gateways(
+    hass: HomeAssistant, refresh: bool = False
+) -> list[DiscoveredGateway]:
+    """Return the IT600 gateways on the local networks.
+
+    Results are cached for DISCOVERY_CACHE_TTL seconds, so reopening the
+    config flow does not scan again.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cached: tuple[float, list[DiscoveredGateway]] | None = domain_data.get(
+        DATA_DISCOVERY
+    )
+    if not refresh and cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    await async_import_library(hass, GATEWAY_TYPE_IT600)
+    hosts = scan_hosts(await network.async_get_adapters(hass))
+    started = time.monotonic()
+    gateways = await async_scan(async_get_clientsession(hass), hosts)
+    _LOGGER.debug(
+        "Scanned %d hosts in %.1fs, found %d IT600 gateway(s)",
+        len(hosts),
+        time.monotonic() - started,
+        len(gateways),
+    )
+    domain_data[DATA_DISCOVERY] = (time.monotonic() + DISCOVERY_CACHE_TTL, gateways)
+    return gateways
@@ -0,0 +1,90 @@
+"""Base entity for Salus devices."""
+from __future__ import annotations
+
+from collections.abc import Awaitable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .capabilities import get_capabilities
+from .commands import CommandQueue
+from .const import ATTR_PENDING, ATTR_RESTORED, ATTR_STALE_AGE, DOMAIN
+from .coordinator import SalusDataUpdateCoordinator
+from .models import DeviceState
+
+
+class SalusEntity(CoordinatorEntity[SalusDataUpdateCoordinator]):
+    """Entity bound to one device record of the coordinator snapshot.
+
+    The record is resolved once per coordinator update, so properties of
+    subclasses read ``self._device`` directly.
+    """
+
+    # Snapshot category of the device, and the name used for unknown models
+    _category: str
+    _default_name: str
+
+    def __init__(
+        self,
+        coordinator: SalusDataUpdateCoordinator,
+        commands: CommandQueue,
+        device_id: str,
+        device: DeviceState,
+    ) -> None:
+        """Initialize the entity."""
+        super().__init__(coordinator, context=(self._category, device_id))
+        self._commands = commands
+        self._device_id = device_id
+        self._device = device
+        self._device_present = True
+        self._attr_unique_id = f"{DOMAIN}_{device_id}_{self._category}"
+
+        model = device.model or "Unknown"
+        self._capabilities = get_capabilities(
+            coordinator.gateway_type, self._category, model
+        )
+
+        self._attr_name = f"{self._capabilities.name or self._default_name} {device_id}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, device_id)},
+            name=self._attr_name,
+            manufacturer="Salus",
+            model=model,
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Pick up the new record for this device and write state."""
+        device = self.coordinator.data.get(self._category, {}).get(self._device_id)
+        self._device_present = device is not None
+        if device is not None:
+            self._device = device
+        super()._handle_coordinator_update()
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available."""
+        return super().available and self._device_present and self._device.available
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return entity specific state attributes."""
+        attributes: dict[str, Any] = {}
+        if self.coordinator.is_pending(self._category, self._device_id):
+            attributes[ATTR_PENDING] = True
+        if self.coordinator.restored:
+            attributes[ATTR_RESTORED] = True
+        if self.coordinator.stale and (age := self.coordinator.data_age) is not None:
+            attributes[ATTR_STALE_AGE] = round(age)
+        return attributes
+
+    async def _async_send(self, command: Awaitable[None], **fields: Any) -> None:
+        """Show the commanded values right away and send the command."""
+        self.coordinator.async_set_pending(self._category, self._device_id, **fields)
+        try:
+            await command
+        except Exception:
+            self.coordinator.async_clear_pending(self._category, self._device_id)
+            raise
@@ -1,14 +1,79 @@
 """Gateway factory and wrapper classes for Salus devices."""
 from __future__ import annotations
 
+import asyncio
+from functools import partial
+import importlib
+import json
 import logging
+import sys
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict
-
-from .const import GATEWAY_TYPE_IT500, GATEWAY_TYPE_IT600
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+import aiohttp
+
+from homeassistant.components.climate import HVACAction, HVACMode
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    GATEWAY_TYPE_IT500,
+    GATEWAY_TYPE_IT600,
+    IT500_BATCH_MAX_AGE,
+    IT500_MAX_CONCURRENCY,
+    IT500_MIN_REQUEST_RATE,
+    IT500_PRIORITY_CONFIRM,
+    IT500_PRIORITY_LOGIN,
+    IT500_PRIORITY_POLL,
+    IT500_PRIORITY_WRITE,
+    IT500_RELOGIN_REUSE,
+    IT500_REQUEST_BURST,
+    IT500_REQUEST_RATE,
+    IT500_THROTTLE_PAUSE,
+    IT500_THROTTLE_RETRIES,
+    IT500_TOKEN_LIFETIME,
+    IT500_WRITE_WINDOW,
+    IT600_CONNECTIONS_PER_HOST,
+    IT600_KEEPALIVE_TIMEOUT,
+    IT600_OFFLOAD_DEVICES,
+    IT600_OFFLOAD_SIZE,
+    IT600_POLL_TIERS,
+    IT600_PORT,
+    IT600_REQUEST_TIMEOUT,
+)
+from .models import (
+    BinarySensorState,
+    ClimateState,
+    CoverState,
+    SensorState,
+    SwitchState,
+)
+from .ratelimit import CloudRequestQueue
+
+if TYPE_CHECKING:
+    from .storage import IT500TokenStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# pyit600 reports the running state as free text
+IT600_HVAC_ACTIONS = {
+    "off": HVACAction.OFF,
+    "idle": HVACAction.IDLE,
+    "heating": HVACAction.HEATING,
+    "heating (idling)": HVACAction.IDLE,
+    "cooling": HVACAction.COOLING,
+    "cooling (idling)": HVACAction.IDLE,
+}
+
+
+def to_hvac_mode(mode: Any) -> HVACMode:
+    """Convert a gateway mode string to HVACMode, defaulting to off."""
+    try:
+        return HVACMode(mode)
+    except ValueError:
+        return HVACMode.OFF
+
 
 class SalusGatewayBase(ABC):
     """Base class for Salus gateways."""
@@ -21,6 +86,10 @@ class SalusGatewayBase(ABC):
     async def poll_status(self) -> dict[str, Any]:
         """Poll status from gateway."""
 
+    async def reconnect(self) -> None:
+        """Connect again after polls failed, keeping the transport."""
+        await self.connect()
+
     @abstractmethod
     async def close(self) -> None:
         """Close connection to gateway."""
@@ -45,61 +114,448 @@ class SalusGatewayBase(ABC):
     def get_cover_devices(self) -> dict[str, Any]:
         """Get cover devices."""
 
+    def set_update_callback(
+        self, update_callback: Callable[[dict[str, Any]], None] | None
+    ) -> None:
+        """Register a callback for snapshots fetched outside poll_status.
+
+        Only gateways that share their transport with other entries push
+        data this way; the default is a no-op.
+        """
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return connection reuse counters of the transport, if it has any."""
+        return {}
+
+    @property
+    def poll_tiers(self) -> dict[str, dict[str, float | None]]:
+        """Return the refresh period and data age of each poll tier."""
+        return {}
+
+    @property
+    def request_queue_stats(self) -> dict[str, Any]:
+        """Return the state of the request queue the gateway shares, if any."""
+        return {}
+
+    # Phase timings (seconds) and payload size (bytes) of the last poll_status
+    last_poll_stats: dict[str, float] = {}
+
 
 # ---------------------------------------------------------------------------
 # IT600 (local) – bazat pe pyit600
 # ---------------------------------------------------------------------------
 
 
-class IT600Gateway(SalusGatewayBase):
-    """Wrapper for IT600 local gateway."""
+class IT600SessionPool:
+    """HTTP session shared by all IT600 gateways.
+
+    The session keeps up to IT600_CONNECTIONS_PER_HOST idle connections per
+    gateway, so polls reuse sockets instead of opening one per request. It
+    is closed when the last gateway releases it, or when Home Assistant
+    closes, which does not unload config entries first.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the pool."""
+        self._session: aiohttp.ClientSession | None = None
+        self.users = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def acquire(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it if needed."""
+        if self._session is None or self._session.closed:
+            trace = aiohttp.TraceConfig()
+            trace.on_connection_create_end.append(self._on_connection_create)
+            trace.on_connection_reuseconn.append(self._on_connection_reuse)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit_per_host=IT600_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=IT600_KEEPALIVE_TIMEOUT,
+                ),
+                trace_configs=[trace],
+            )
+        self.users += 1
+        return self._session
+
+    async def async_release(self) -> None:
+        """Release the session, closing it once no gateway uses it."""
+        self.users -= 1
+        if self.users == 0 and self._session is not None:
+            _LOGGER.debug("Closing the shared IT600 session: %s", self.stats)
+            await self.async_close()
+
+    async def async_close(self) -> None:
+        """Close the session, whether or not gateways still use it."""
+        if self._session is not None:
+            session, self._session = self._session, None
+            await session.close()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return connection reuse counters."""
+        return {
+            "users": self.users,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+        }
+
+    async def _on_connection_create(self, *_: Any) -> None:
+        """Count a new connection."""
+        self.connections_created += 1
+
+    async def _on_connection_reuse(self, *_: Any) -> None:
+        """Count a reused connection."""
+        self.connections_reused += 1
+
 
-    def __init__(self, host: str, euid: str) -> None:
+IT600_SESSION_POOL = IT600SessionPool()
+
+
+def _is_it600_binary_sensor(device: dict[str, Any]) -> bool:
+    """Return True for readall entries pyit600 treats as binary sensors."""
+    return "sIASZS" in device or device.get("sBasicS", {}).get(
+        "ModelIdentifier"
+    ) in ("it600MINITRV", "it600Receiver")
+
+
+# readall entries of each category, as pyit600 picks them, and the pyit600
+# method that reads their details
+IT600_CATEGORY_READS: dict[str, tuple[Callable[[dict[str, Any]], bool], str]] = {
+    "climate": (
+        lambda device: "sIT600TH" in device or "sTherS" in device,
+        "_refresh_climate_devices",
+    ),
+    "binary_sensor": (_is_it600_binary_sensor, "_refresh_binary_sensor_devices"),
+    "sensor": (lambda device: "sTempS" in device, "_refresh_sensor_devices"),
+    "switch": (lambda device: "sOnOffS" in device, "_refresh_switch_devices"),
+    "cover": (lambda device: "sLevelS" in device, "_refresh_cover_devices"),
+}
+
+
+class IT600Gateway(SalusGatewayBase):
+    """Wrapper for IT600 local gateway.
+
+    Polls are tiered: each part of the snapshot is only read from the
+    gateway when its IT600_POLL_TIERS period has passed, and the records of
+    the other categories are carried over from the previous poll.
+
+    Requests use the shared IT600 session unless a ``session`` is given.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        euid: str,
+        port: int = IT600_PORT,
+        session: aiohttp.ClientSession | None = None,
+        request_timeout: float = IT600_REQUEST_TIMEOUT,
+    ) -> None:
         """Initialize IT600 gateway."""
         # Lazy import – doar când chiar folosim IT600
         from pyit600.gateway import IT600Gateway as PyIT600Gateway
 
-        self._gateway = PyIT600Gateway(host=host, euid=euid)
+        # pyit600 does not close a session it was given
+        self._pooled = session is None
+        self._session: aiohttp.ClientSession | None = (
+            IT600_SESSION_POOL.acquire() if session is None else session
+        )
+        self._request_timeout = request_timeout
+        self.mac: str | None = None
+        self._gateway = PyIT600Gateway(
+            host=host, euid=euid, port=port, session=self._session
+        )
+        self._device_data: dict[str, Any] = {}
+        self._inventory: list[dict[str, Any]] = []
+        self._refreshed_at: dict[str, float] = {}
+        self._encryptor = self._gateway._encryptor
+        self._request_lock = asyncio.Lock()
+        self._request_url = f"http://{host}:{port}/deviceid/"
+        self._parse_seconds = 0.0
+        self._loop_seconds = 0.0
+        self._payload_size = 0
+        self.offload_size = IT600_OFFLOAD_SIZE
+        self.offload_devices = IT600_OFFLOAD_DEVICES
+        # Every pyit600 request goes through _async_request. This, like the
+        # tiered poll, relies on pyit600 internals: the version is pinned in
+        # manifest.json, so check them again before raising the pin.
+        self._gateway._make_encrypted_request = self._async_request
+
+    def _decode(self, response: bytes) -> Any:
+        """Decrypt and parse a gateway response."""
+        return json.loads(self._encryptor.decrypt(response))
+
+    async def _async_request(self, command: str, request_body: dict[str, Any]) -> Any:
+        """Make an encrypted request the way pyit600 does.
+
+        Large responses are decrypted and parsed in the executor, so they
+        do not block the event loop.
+        """
+        from pyit600.exceptions import IT600CommandError, IT600ConnectionError
+
+        async with self._request_lock:
+            try:
+                async with asyncio.timeout(self._request_timeout), self._session.post(
+                    self._request_url + command,
+                    data=self._encryptor.encrypt(json.dumps(request_body)),
+                    headers={"content-type": "application/json"},
+                ) as response:
+                    payload = await response.read()
+                started = time.perf_counter()
+                if len(payload) >= self.offload_size:
+                    result = await asyncio.get_running_loop().run_in_executor(
+                        None, self._decode, payload
+                    )
+                else:
+                    result = self._decode(payload)
+                    self._loop_seconds += time.perf_counter() - started
+                self._parse_seconds += time.perf_counter() - started
+                self._payload_size += len(payload)
+            except TimeoutError as err:
+                raise IT600ConnectionError(
+                    "Error occurred while communicating with iT600 gateway: timeout"
+                ) from err
+            except aiohttp.ClientConnectorError as err:
+                raise IT600ConnectionError(
+                    "Error occurred while communicating with iT600 gateway: "
+                    "check if you have specified host/IP address correctly"
+                ) from err
+            except Exception as err:
+                raise IT600CommandError(
+                    f"Error occurred while communicating with iT600 gateway: {err!r}"
+                ) from err
+
+        if result.get("status") != "success":
+            raise IT600CommandError(
+                f"iT600 gateway rejected '{command}' command with content"
+                f" '{request_body!r}'"
+            )
+        return result
 
     async def connect(self) -> None:
-        """Connect to the gateway."""
-        await self._gateway.connect()
+        """Connect to the gateway and read its MAC address."""
+        self.mac = await self._gateway.connect()
+
+    async def reconnect(self) -> None:
+        """Connect again and read everything on the next poll."""
+        self._refreshed_at.clear()
+        await self.connect()
+
+    def _due_tiers(self, now: float) -> list[str]:
+        """Return the poll tiers whose refresh period has passed."""
+        last = self._refreshed_at.get("inventory")
+        if last is None or now - last >= IT600_POLL_TIERS["inventory"]:
+            return list(IT600_POLL_TIERS)
+        return [
+            tier
+            for tier, period in IT600_POLL_TIERS.items()
+            if tier != "inventory"
+            and (
+                (refreshed := self._refreshed_at.get(tier)) is None
+                or now - refreshed >= period
+            )
+        ]
 
     async def poll_status(self) -> dict[str, Any]:
-        """Poll status from gateway."""
-        await self._gateway.poll_status()
-        data = {
-            "climate": self._gateway.get_climate_devices(),
-            "binary_sensor": self._gateway.get_binary_sensor_devices(),
-            "sensor": self._gateway.get_sensor_devices(),
-            "switch": self._gateway.get_switch_devices(),
-            "cover": self._gateway.get_cover_devices(),
+        """Poll the tiers that are due and return the merged snapshot."""
+        self._parse_seconds = 0.0
+        self._loop_seconds = 0.0
+        self._payload_size = 0
+        started = time.perf_counter()
+        now = time.monotonic()
+        gateway = self._gateway
+        due = self._due_tiers(now)
+        if "inventory" in due:
+            inventory = await gateway._make_encrypted_request(
+                "read", {"requestAttr": "readall"}
+            )
+            self._inventory = inventory["id"]
+            try:
+                await gateway._refresh_gateway_device(
+                    [device for device in self._inventory if "sGateway" in device]
+                )
+            except Exception:
+                _LOGGER.exception("Failed to poll gateway device")
+        # like pyit600's own poll_status, a category that fails to read is
+        # logged and keeps its previous records; it is read again next poll
+        categories = []
+        for category in list(due):
+            if category not in IT600_CATEGORY_READS:
+                continue
+            matches, method = IT600_CATEGORY_READS[category]
+            try:
+                await getattr(gateway, method)(
+                    [device for device in self._inventory if matches(device)]
+                )
+            except Exception:
+                _LOGGER.exception("Failed to poll %s devices", category)
+                due.remove(category)
+                continue
+            categories.append(category)
+        self._refreshed_at.update(dict.fromkeys(due, now))
+        fetched = time.perf_counter()
+        if len(self._inventory) >= self.offload_devices:
+            data = await asyncio.get_running_loop().run_in_executor(
+                None, self._build_snapshot, categories
+            )
+        else:
+            data = self._build_snapshot(categories)
+            self._loop_seconds += time.perf_counter() - fetched
+
+        # pyit600 builds its device objects inside the requests; only
+        # decryption and JSON parsing are timed separately. "loop" is the
+        # time decryption, parsing and building the snapshot blocked the
+        # event loop, i.e. the part of them not run in the executor.
+        self.last_poll_stats = {
+            "request": fetched - started - self._parse_seconds,
+            "parse": self._parse_seconds,
+            "normalize": time.perf_counter() - fetched,
+            "loop": self._loop_seconds,
+            "payload_size": self._payload_size,
         }
         return data
 
+    def _build_snapshot(
+        self, categories: Iterable[str] = IT600_CATEGORY_READS
+    ) -> dict[str, Any]:
+        """Convert the devices last polled by pyit600 to records.
+
+        Only ``categories`` are rebuilt; the others keep their records.
+        """
+        self._device_data = {
+            **self._device_data,
+            **{category: self._build_category(category) for category in categories},
+        }
+        return self._device_data
+
+    def _build_category(self, category: str) -> dict[str, Any]:
+        """Convert the devices of one category to records."""
+        gateway = self._gateway
+        if category == "climate":
+            return {
+                device_id: self._climate_state(device)
+                for device_id, device in gateway.get_climate_devices().items()
+            }
+        if category == "binary_sensor":
+            return {
+                device_id: BinarySensorState(
+                    device_id,
+                    device.name,
+                    device.model,
+                    device.available,
+                    is_on=device.is_on,
+                    device_class=device.device_class,
+                )
+                for device_id, device in gateway.get_binary_sensor_devices().items()
+            }
+        if category == "sensor":
+            return {
+                device_id: SensorState(
+                    device_id,
+                    device.name,
+                    device.model,
+                    device.available,
+                    native_value=device.state,
+                    unit_of_measurement=device.unit_of_measurement,
+                    device_class=device.device_class,
+                )
+                for device_id, device in gateway.get_sensor_devices().items()
+            }
+        if category == "switch":
+            return {
+                device_id: SwitchState(
+                    device_id,
+                    device.name,
+                    device.model,
+                    device.available,
+                    is_on=device.is_on,
+                    device_class=device.device_class,
+                )
+                for device_id, device in gateway.get_switch_devices().items()
+            }
+        return {
+            device_id: CoverState(
+                device_id,
+                device.name,
+                device.model,
+                device.available,
+                current_position=device.current_cover_position,
+                is_opening=device.is_opening,
+                is_closing=device.is_closing,
+                is_closed=device.is_closed,
+            )
+            for device_id, device in gateway.get_cover_devices().items()
+        }
+
+    @staticmethod
+    def _climate_state(device: Any) -> ClimateState:
+        """Build a climate record from a pyit600 ClimateDevice."""
+        hvac_action = IT600_HVAC_ACTIONS.get(device.hvac_action, HVACAction.IDLE)
+        return ClimateState(
+            device.unique_id,
+            device.name,
+            device.model,
+            device.available,
+            current_temperature=device.current_temperature,
+            target_temperature=device.target_temperature,
+            min_temp=device.min_temp,
+            max_temp=device.max_temp,
+            hvac_mode=to_hvac_mode(device.hvac_mode),
+            hvac_action=hvac_action,
+            preset_mode=device.preset_mode,
+            is_heating=hvac_action == HVACAction.HEATING,
+            humidity=device.current_humidity,
+        )
+
+    @property
+    def poll_tiers(self) -> dict[str, dict[str, float | None]]:
+        """Return the refresh period and data age of each poll tier."""
+        now = time.monotonic()
+        return {
+            tier: {
+                "period": period,
+                "age": (
+                    round(now - refreshed, 1)
+                    if (refreshed := self._refreshed_at.get(tier)) is not None
+                    else None
+                ),
+            }
+            for tier, period in IT600_POLL_TIERS.items()
+        }
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return connection reuse counters of the shared session."""
+        return IT600_SESSION_POOL.stats
+
     async def close(self) -> None:
-        """Close connection to gateway."""
+        """Close connection to gateway, keeping shared sockets open."""
         await self._gateway.close()
+        if self._session is not None:
+            self._session = None
+            if self._pooled:
+                await IT600_SESSION_POOL.async_release()
 
     def get_climate_devices(self) -> dict[str, Any]:
         """Get climate devices."""
-        return self._gateway.get_climate_devices()
+        return self._device_data.get("climate", {})
 
     def get_binary_sensor_devices(self) -> dict[str, Any]:
         """Get binary sensor devices."""
-        return self._gateway.get_binary_sensor_devices()
+        return self._device_data.get("binary_sensor", {})
 
     def get_sensor_devices(self) -> dict[str, Any]:
         """Get sensor devices."""
-        return self._gateway.get_sensor_devices()
+        return self._device_data.get("sensor", {})
 
     def get_switch_devices(self) -> dict[str, Any]:
         """Get switch devices."""
-        return self._gateway.get_switch_devices()
+        return self._device_data.get("switch", {})
 
     def get_cover_devices(self) -> dict[str, Any]:
         """Get cover devices."""
-        return self._gateway.get_cover_devices()
+        return self._device_data.get("cover", {})
 
     async def set_climate_device_temperature(
         self, device_id: str, temperature: float
@@ -125,15 +581,11 @@ class IT600Gateway(SalusGatewayBase):
 
     async def open_cover_device(self, device_id: str) -> None:
         """Open cover device."""
-        await self._gateway.open_cover_device(device_id)
+        await self._gateway.open_cover(device_id)
 
     async def close_cover_device(self, device_id: str) -> None:
         """Close cover device."""
-        await self._gateway.close_cover_device(device_id)
-
-    async def stop_cover_device(self, device_id: str) -> None:
-        """Stop cover device."""
-        await self._gateway.stop_cover_device(device_id)
+        await self._gateway.close_cover(device_id)
 
     async def set_cover_position(self, device_id: str, position: int) -> None:
         """Set cover position."""
@@ -145,163 +597,465 @@ class IT600Gateway(SalusGatewayBase):
 # ---------------------------------------------------------------------------
 
 
-class IT500Gateway(SalusGatewayBase):
-    """Wrapper for IT500 cloud gateway."""
-
-    def __init__(self, username: str, password: str, device_id: str) -> None:
-        """Initialize IT500 gateway."""
+# Cloud fields written to put an IT500 thermostat in each mode; heat and
+# auto also set the preset field (CH1autoOff), so a preset written along
+# with them must agree
+IT500_MODE_FIELDS: dict[str, dict[str, Any]] = {
+    "off": {"CH1heatOffOn": 0},
+    "heat": {"CH1heatOffOn": 1, "CH1autoOff": "manual"},
+    "auto": {"CH1heatOffOn": 1, "CH1autoOff": "auto"},
+}
+
+# Every salus-it500.com request of the process, of any account, waits here
+IT500_REQUEST_QUEUE = CloudRequestQueue(
+    IT500_REQUEST_RATE,
+    IT500_REQUEST_BURST,
+    IT500_MAX_CONCURRENCY,
+    IT500_MIN_REQUEST_RATE,
+    IT500_THROTTLE_PAUSE,
+    IT500_THROTTLE_RETRIES,
+)
+
+# Attributes of pyit500's Auth that may hold the session token
+IT500_TOKEN_ATTRS = ("token", "_token")
+
+
+def _get_auth_token(auth: Any) -> str | None:
+    """Return the session token of a logged-in pyit500 Auth, if exposed."""
+    for attr in IT500_TOKEN_ATTRS:
+        if token := getattr(auth, attr, None):
+            return token
+    return None
+
+
+def _set_auth_token(auth: Any, token: str) -> bool:
+    """Put a saved session token on a pyit500 Auth; False if unsupported."""
+    for attr in IT500_TOKEN_ATTRS:
+        if hasattr(auth, attr):
+            setattr(auth, attr, token)
+            return True
+    return False
+
+
+class IT500CloudClient:
+    """Authenticated salus-it500.com session shared by all entries of a user.
+
+    Every poll of any entry fetches all registered devices of the account
+    in one batch. Polls that arrive while a batch is running, or within
+    IT500_BATCH_MAX_AGE seconds after it, reuse its results, and every other
+    registered gateway gets the fresh data pushed to its coordinator.
+
+    Writes to a device within IT500_WRITE_WINDOW seconds of each other are
+    merged into one request, after which only that device is read again to
+    confirm the written values; the read is pushed to its gateway and
+    replaces the device in the current batch. The first write of a window
+    takes precedence: a later one that gives a field another value, such as
+    a preset that contradicts the CH1autoOff of a mode, is rejected with
+    ValueError instead of silently overriding it.
+
+    Every request waits its turn in IT500_REQUEST_QUEUE, which paces the
+    requests of all accounts and lets logins, then writes, then their
+    read-backs, go ahead of polls.
+
+    With a token store, the session token survives restarts: a saved token
+    is reused instead of logging in, and a fresh login only happens when the
+    cloud rejects it.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        token_store: IT500TokenStore | None = None,
+    ) -> None:
+        """Initialize the client."""
         self._username = username
         self._password = password
-        self._device_id = device_id
+        self._token_store = token_store
+        self._auth = None
         self._client = None
-        self._device_data: dict[str, Any] = {}
+        self._token_verified = False
+        self.login_count = 0
+        self.token_reuse_count = 0
+        self.relogin_count = 0
+        self._connect_lock = asyncio.Lock()
+        self._login_time: float | None = None
+        self._relogin: asyncio.Task[None] | None = None
+        self._gateways: dict[str, IT500Gateway] = {}
+        self._batch: asyncio.Task[dict[str, Any]] | None = None
+        self._batch_ids: set[str] = set()
+        self._batch_waiters: set[str] = set()
+        self._batch_time = 0.0
+        self.batch_count = 0
+        self._writes: dict[str, tuple[dict[str, Any], asyncio.Future[None]]] = {}
+        self._write_tasks: set[asyncio.Task[None]] = set()
+        self.write_count = 0
+        self.merged_write_count = 0
+        self.confirm_count = 0
+
+    @property
+    def username(self) -> str:
+        """Return the account the session belongs to."""
+        return self._username
+
+    def set_password(self, password: str) -> None:
+        """Use a new password, logging in again on the next connect."""
+        if password != self._password:
+            self._password = password
+            self._client = None
+
+    def register(self, gateway: IT500Gateway) -> None:
+        """Add a gateway whose device is fetched in every batch."""
+        self._gateways[gateway.device_id] = gateway
+
+    def unregister(self, gateway: IT500Gateway) -> None:
+        """Remove a gateway."""
+        if self._gateways.get(gateway.device_id) is gateway:
+            del self._gateways[gateway.device_id]
+
+    @property
+    def in_use(self) -> bool:
+        """Return True while gateways are registered."""
+        return bool(self._gateways)
+
+    async def async_connect(self) -> None:
+        """Log in once for all entries of the account."""
+        async with self._connect_lock:
+            if self._client is not None:
+                return
+
+            try:
+                # importăm aici ca să nu stricăm importul config_flow dacă lipsesc deps
+                from pyit500.auth import Auth
+                from pyit500.pyit500 import PyIt500
+            except Exception as err:  # ImportError etc.
+                _LOGGER.error("pyit500 library not available: %s", err)
+                raise
+
+            # Auth este o clasă, async_login este metodă de instanță
+            auth = self._auth = Auth(self._username, self._password)
+            token = self._token_store.get(self._username) if self._token_store else None
+            if token is not None and _set_auth_token(auth, token):
+                self._token_verified = False
+                self.token_reuse_count += 1
+                _LOGGER.debug("Reusing saved IT500 session for %s", self._username)
+            else:
+                await self._async_login()
+
+            # Clientul principal folosește auth deja logat
+            self._client = PyIt500(auth)
+
+    async def _async_login(self) -> None:
+        """Log in and save the new session token."""
+        await IT500_REQUEST_QUEUE.async_call(
+            IT500_PRIORITY_LOGIN, self._auth.async_login
+        )
+        self.login_count += 1
+        self._login_time = time.monotonic()
+        self._token_verified = True
+        if self._token_store is not None and (token := _get_auth_token(self._auth)):
+            self._token_store.async_set(
+                self._username, token, time.time() + IT500_TOKEN_LIFETIME
+            )
 
-    async def connect(self) -> None:
-        """Connect to the IT500 cloud."""
+    async def _async_relogin(self) -> None:
+        """Log in again after the cloud rejected a reused token."""
+        async with self._connect_lock:
+            if self._token_verified:
+                return
+            _LOGGER.debug("Saved IT500 session for %s rejected", self._username)
+            if self._token_store is not None:
+                self._token_store.async_remove(self._username)
+            self.relogin_count += 1
+            await self._async_login()
+
+    async def async_reconnect(self) -> None:
+        """Log in again, or for the first time if never connected.
+
+        Every entry of the account reconnects this one session, so a
+        reconnect joins the login in flight, or skips logging in if one
+        succeeded less than IT500_RELOGIN_REUSE seconds ago.
+        """
+        if self._client is None:
+            await self.async_connect()
+            return
+        if (
+            self._login_time is not None
+            and time.monotonic() - self._login_time < IT500_RELOGIN_REUSE
+        ):
+            return
+        if (relogin := self._relogin) is None:
+            relogin = self._relogin = asyncio.create_task(self._async_reconnect())
+        await asyncio.shield(relogin)
+
+    async def _async_reconnect(self) -> None:
+        """Log in again for all entries of the account."""
         try:
-            # importăm aici ca să nu stricăm importul config_flow dacă lipsesc deps
-            from pyit500.auth import Auth
-            from pyit500.pyit500 import PyIt500
-        except Exception as err:  # ImportError etc.
-            _LOGGER.error("pyit500 library not available: %s", err)
-            raise
-
-        # Auth este o clasă, async_login este metodă de instanță
-        auth = Auth(self._username, self._password)
-        await auth.async_login()
-
-        # Clientul principal folosește auth deja logat
-        self._client = PyIt500(auth)
-
-    async def poll_status(self) -> dict[str, Any]:
-        """Poll status from IT500 cloud."""
-        if not self._client:
+            async with self._connect_lock:
+                self.relogin_count += 1
+                await self._async_login()
+        finally:
+            self._relogin = None
+
+    async def async_get_device(self, device_id: str) -> dict[str, Any]:
+        """Return the raw state of a device from the current batch."""
+        if self._client is None:
             raise RuntimeError("IT500 gateway not connected")
 
-        # pyit500 expune async_get_device
-        device = await self._client.async_get_device(self._device_id)
-
-        # device este, în mod normal, un obiect; luăm atributele prin getattr/vars
-        if hasattr(device, "__dict__"):
-            raw = device.__dict__
-        else:
-            # fallback dacă e deja dict-like
-            raw = dict(device)
+        batch = self._batch
+        if (
+            batch is None
+            or device_id not in self._batch_ids
+            or batch.done()
+            and time.monotonic() - self._batch_time > IT500_BATCH_MAX_AGE
+        ):
+            self._batch_ids = set(self._gateways) | {device_id}
+            # each batch fans out to the gateways that did not join it, even
+            # after a newer batch replaced it
+            self._batch_waiters = set()
+            batch = self._batch = asyncio.create_task(
+                self._async_fetch_all(list(self._batch_ids))
+            )
+            batch.add_done_callback(
+                partial(self._async_fan_out, self._batch_waiters)
+            )
 
-        self._device_data = {
-            "climate": {
-                self._device_id: {
-                    "model": raw.get("product", "IT500"),
-                    "current_temperature": raw.get("CH1currentTemperature"),
-                    "target_temperature": raw.get("CH1currentSetPoint"),
-                    "hvac_mode": self._get_hvac_mode(raw),
-                    "is_heating": raw.get("CH1heatOnOff") == 1,
-                    "preset_mode": raw.get("CH1autoOff", "manual"),
-                }
-            },
-            "binary_sensor": {},
-            "sensor": {},
-            "switch": {},
-            "cover": {},
-        }
+        self._batch_waiters.add(device_id)
+        results = await asyncio.shield(batch)
+        result = results[device_id]
+        if isinstance(result, Exception):
+            raise result
+        return result
 
-        return self._device_data
+    async def _async_fetch_all(self, device_ids: list[str]) -> dict[str, Any]:
+        """Fetch the given devices, as the request queue lets them through."""
 
-    def _get_hvac_mode(self, data: dict) -> str:
-        """Get HVAC mode from IT500 data."""
-        if data.get("CH1heatOffOn") == 0:
-            return "off"
-        if data.get("CH1autoOff") == "auto":
-            return "auto"
-        return "heat"
+        async def fetch(device_id: str) -> Any:
+            device = await self._async_call(
+                IT500_PRIORITY_POLL, self._client.async_get_device, device_id
+            )
+            return self._as_dict(device_id, device)
 
-    async def close(self) -> None:
-        """Close connection to gateway."""
-        # PyIt500 nu are close(), nu facem nimic
-        return
+        results = await asyncio.gather(
+            *(fetch(device_id) for device_id in device_ids), return_exceptions=True
+        )
+        self._batch_time = time.monotonic()
+        self.batch_count += 1
+        return dict(zip(device_ids, results))
+
+    async def _async_call(
+        self, priority: int, method: Callable[..., Awaitable[Any]], *args: Any
+    ) -> Any:
+        """Call the cloud, logging in again once if a reused token is rejected."""
+        try:
+            result = await IT500_REQUEST_QUEUE.async_call(priority, method, *args)
+        except Exception:
+            if self._token_verified:
+                raise
+            await self._async_relogin()
+            result = await IT500_REQUEST_QUEUE.async_call(priority, method, *args)
+        else:
+            self._token_verified = True
+        return result
 
-    # === „getter”-e necesare pentru platforme ===
+    async def async_write(self, device_id: str, values: dict[str, Any]) -> None:
+        """Write cloud fields of a device, merged with other writes to it."""
+        if self._client is None:
+            raise RuntimeError("IT500 gateway not connected")
 
-    def get_climate_devices(self) -> dict[str, Any]:
-        return self._device_data.get("climate", {})
+        if (write := self._writes.get(device_id)) is None:
+            write = self._writes[device_id] = (
+                {},
+                asyncio.get_running_loop().create_future(),
+            )
+            task = asyncio.create_task(self._async_send_write(device_id))
+            self._write_tasks.add(task)
+            task.add_done_callback(self._write_tasks.discard)
+        else:
+            if conflicts := sorted(
+                field
+                for field, value in values.items()
+                if field in write[0] and write[0][field] != value
+            ):
+                raise ValueError(
+                    f"Write of {', '.join(conflicts)} to IT500 device {device_id}"
+                    " conflicts with a write already waiting to be sent"
+                )
+            self.merged_write_count += 1
+        write[0].update(values)
+        await asyncio.shield(write[1])
+
+    async def _async_send_write(self, device_id: str) -> None:
+        """Send the merged writes of a device once its window closed."""
+        await asyncio.sleep(IT500_WRITE_WINDOW)
+        values, future = self._writes.pop(device_id)
+        try:
+            await self._async_call(
+                IT500_PRIORITY_WRITE, self._client.async_set_device, device_id, values
+            )
+        except Exception as err:  # noqa: BLE001
+            future.set_exception(err)
+            # retrieved here in case every caller was cancelled
+            future.exception()
+            return
+        self.write_count += 1
+        future.set_result(None)
+        await self._async_confirm(device_id)
+
+    async def _async_confirm(self, device_id: str) -> None:
+        """Read a written device again and hand its state to its gateway."""
+        try:
+            raw = self._as_dict(
+                device_id,
+                await self._async_call(
+                    IT500_PRIORITY_CONFIRM, self._client.async_get_device, device_id
+                ),
+            )
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.debug("Could not read IT500 device %s back: %s", device_id, err)
+            return
+        self.confirm_count += 1
+        batch = self._batch
+        if (
+            batch is not None
+            and batch.done()
+            and not batch.cancelled()
+            and batch.exception() is None
+            and device_id in (results := batch.result())
+        ):
+            results[device_id] = raw
+        if (gateway := self._gateways.get(device_id)) is not None:
+            gateway.handle_batch_result(raw)
+
+    def _async_fan_out(
+        self, waiters: set[str], batch: asyncio.Task[dict[str, Any]]
+    ) -> None:
+        """Push the batch results to the gateways that did not poll for it."""
+        if batch.cancelled() or batch.exception() is not None:
+            return
+        for device_id, raw in batch.result().items():
+            if isinstance(raw, Exception) or device_id in waiters:
+                continue
+            if (gateway := self._gateways.get(device_id)) is not None:
+                gateway.handle_batch_result(raw)
 
-    def get_binary_sensor_devices(self) -> dict[str, Any]:
-        return self._device_data.get("binary_sensor", {})
+    @staticmethod
+    def _as_dict(device_id: str, device: Any) -> dict[str, Any]:
+        """Convert a pyit500 Device object to a dict-like structure."""
+        if isinstance(device, dict):
+            return device
+        if hasattr(device, "to_dict"):
+            return device.to_dict()
+        if hasattr(device, "__dict__"):
+            return vars(device)
+        _LOGGER.warning(
+            "Unsupported device type returned from pyit500 for %s: %s",
+            device_id,
+            type(device),
+        )
+        return {}
 
-    def get_sensor_devices(self) -> dict[str, Any]:
-        return self._device_data.get("sensor", {})
 
-    def get_switch_devices(self) -> dict[str, Any]:
-        return self._device_data.get("switch", {})
+# Shared sessions, one per salus-it500.com account
+_IT500_CLIENTS: dict[str, IT500CloudClient] = {}
 
-    def get_cover_devices(self) -> dict[str, Any]:
-        return self._device_data.get("cover", {})
 
-    # === comenzi de scriere – deocamdată le lăsăm neimplementate ===
+def acquire_it500_client(
+    username: str, password: str, token_store: IT500TokenStore | None = None
+) -> IT500CloudClient:
+    """Return the shared cloud session of an account, creating it if needed."""
+    if (client := _IT500_CLIENTS.get(username)) is None:
+        client = _IT500_CLIENTS[username] = IT500CloudClient(
+            username, password, token_store
+        )
+    else:
+        client.set_password(password)
+    return client
 
-    async def set_climate_device_temperature(self, device_id: str, temperature: float) -> None:
-        _LOGGER.warning("set_climate_device_temperature not implemented yet for IT500")
 
-    async def set_climate_device_mode(self, device_id: str, mode: str) -> None:
-        _LOGGER.warning("set_climate_device_mode not implemented yet for IT500")
+def release_it500_client(client: IT500CloudClient) -> None:
+    """Forget a shared cloud session once no gateway uses it."""
+    if not client.in_use and _IT500_CLIENTS.get(client.username) is client:
+        del _IT500_CLIENTS[client.username]
 
-    async def set_climate_device_preset(self, device_id: str, preset: str) -> None:
-        _LOGGER.warning("set_climate_device_preset not implemented yet for IT500")
 
+class IT500Gateway(SalusGatewayBase):
     """Wrapper for IT500 cloud gateway."""
 
-    def __init__(self, username: str, password: str, device_id: str) -> None:
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        device_id: str,
+        token_store: IT500TokenStore | None = None,
+    ) -> None:
         """Initialize IT500 gateway."""
         self._username = username
         self._password = password
         self._device_id = device_id
-        self._client = None
-        self._device_data: Dict[str, Any] = {}
+        self._token_store = token_store
+        self._client: IT500CloudClient | None = None
+        self._device_data: dict[str, Any] = {}
+        self._update_callback: Callable[[dict[str, Any]], None] | None = None
+
+    @property
+    def device_id(self) -> str:
+        """Return the cloud device id."""
+        return self._device_id
 
     async def connect(self) -> None:
-        """Initialize IT500 client and verify credentials."""
+        """Connect to the IT500 cloud through the account's shared session."""
+        client = acquire_it500_client(
+            self._username, self._password, self._token_store
+        )
+        client.register(self)
         try:
-            from pyit500.pyit500 import PyIt500
-            from pyit500.auth import Auth
-        except Exception as err:
-            _LOGGER.error("pyit500 library not available: %s", err)
+            await client.async_connect()
+        except Exception:
+            client.unregister(self)
+            release_it500_client(client)
             raise
+        self._client = client
 
-    # Auth is initialized with credentials (no async_login exists)
-    auth = Auth(self._username, self._password)
-    self._client = PyIt500(auth)
-
-    # Sanity check: try to fetch device list
-    try:
-        await self._client.async_get_device_list()
-    except Exception as err:
-        _LOGGER.error("Failed to authenticate or fetch IT500 devices: %s", err)
-        raise
+    async def reconnect(self) -> None:
+        """Log the shared session in again."""
+        if self._client is None:
+            await self.connect()
+        else:
+            await self._client.async_reconnect()
 
+    def set_update_callback(
+        self, update_callback: Callable[[dict[str, Any]], None] | None
+    ) -> None:
+        """Register a callback for data fetched by another entry's poll."""
+        self._update_callback = update_callback
 
     async def poll_status(self) -> dict[str, Any]:
         """Poll status from IT500 cloud."""
         if not self._client:
             raise RuntimeError("IT500 gateway not connected")
 
-        # Fetch device object from API
-        device = await self._client.async_get_device(self._device_id)
+        started = time.perf_counter()
+        raw = await self._client.async_get_device(self._device_id)
+        fetched = time.perf_counter()
+        data = self._build_snapshot(raw)
+        normalized = time.perf_counter() - fetched
+        # the snapshot is built on the event loop
+        self.last_poll_stats = {
+            "request": fetched - started,
+            "normalize": normalized,
+            "loop": normalized,
+        }
+        return data
 
-        # Try to convert Device object to a dict-like structure
-        if isinstance(device, dict):
-            raw = device
-        elif hasattr(device, "to_dict"):
-            raw = device.to_dict()
-        elif hasattr(device, "__dict__"):
-            raw = vars(device)
-        else:
-            raw = {}
-            _LOGGER.warning(
-                "Unsupported device type returned from pyit500 for %s: %s",
-                self._device_id,
-                type(device),
-            )
+    def handle_batch_result(self, raw: dict[str, Any]) -> None:
+        """Take the state of this device from a batch fetched by the session."""
+        snapshot = self._build_snapshot(raw)
+        if self._update_callback is not None:
+            self._update_callback(snapshot)
 
+    def _build_snapshot(self, raw: dict[str, Any]) -> dict[str, Any]:
+        """Map a raw cloud device to the common snapshot structure."""
         # Map to common structure, using IT500-style field names if present
         model = raw.get("product", "IT500")
 
@@ -311,19 +1065,28 @@ class IT500Gateway(SalusGatewayBase):
         heat_off_on = raw.get("CH1heatOffOn")
         auto_off = raw.get("CH1autoOff", "manual")
 
-        hvac_mode = self._get_hvac_mode(heat_off_on, auto_off)
+        hvac_mode = to_hvac_mode(self._get_hvac_mode(heat_off_on, auto_off))
         is_heating = heat_on_off == 1
 
+        if is_heating:
+            hvac_action = HVACAction.HEATING
+        elif hvac_mode == HVACMode.OFF:
+            hvac_action = HVACAction.OFF
+        else:
+            hvac_action = HVACAction.IDLE
+
         self._device_data = {
             "climate": {
-                self._device_id: {
-                    "model": model,
-                    "current_temperature": current_temp,
-                    "target_temperature": target_temp,
-                    "hvac_mode": hvac_mode,
-                    "is_heating": is_heating,
-                    "preset_mode": auto_off,
-                }
+                self._device_id: ClimateState(
+                    self._device_id,
+                    model=model,
+                    current_temperature=current_temp,
+                    target_temperature=target_temp,
+                    hvac_mode=hvac_mode,
+                    hvac_action=hvac_action,
+                    preset_mode=auto_off,
+                    is_heating=is_heating,
+                )
             },
             "binary_sensor": {},
             "sensor": {},
@@ -342,13 +1105,36 @@ class IT500Gateway(SalusGatewayBase):
             return "auto"
         return "heat"
 
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return login and batch counters of the shared cloud session."""
+        if (client := self._client) is None:
+            return {}
+        return {
+            "logins": client.login_count,
+            "token_reuses": client.token_reuse_count,
+            "relogins": client.relogin_count,
+            "batches": client.batch_count,
+            "writes": client.write_count,
+            "merged_writes": client.merged_write_count,
+            "confirm_reads": client.confirm_count,
+        }
+
+    @property
+    def request_queue_stats(self) -> dict[str, Any]:
+        """Return the state of the queue of all salus-it500.com requests."""
+        return IT500_REQUEST_QUEUE.as_dict()
+
     async def close(self) -> None:
         """Close connection.
 
-        pyit500 does not expose an explicit close(), so this is a no-op.
+        pyit500 does not expose an explicit close(); the shared session is
+        dropped once the last gateway of the account is closed.
         """
-        # Nothing to close for HTTP-based API, but method kept for interface compatibility.
-        return
+        if self._client is not None:
+            self._client.unregister(self)
+            release_it500_client(self._client)
+            self._client = None
 
     def get_climate_devices(self) -> dict[str, Any]:
         """Get climate devices."""
@@ -370,41 +1156,80 @@ class IT500Gateway(SalusGatewayBase):
         """Get cover devices."""
         return self._device_data.get("cover", {})
 
-    # Pentru moment, facem IT500 doar read-only; scrierea depinde
-    # de ce metode oferă librăria Device/pyit500 (nu sunt în snippetul pe care îl avem).
+    async def _async_write(self, device_id: str, values: dict[str, Any]) -> None:
+        """Write cloud fields of the device through the shared session."""
+        if not self._client:
+            raise RuntimeError("IT500 gateway not connected")
+        await self._client.async_write(device_id, values)
 
     async def set_climate_device_temperature(
         self, device_id: str, temperature: float
     ) -> None:
-        """Set climate device temperature (NOT IMPLEMENTED YET)."""
-        raise NotImplementedError("Setting temperature is not implemented for IT500 yet")
+        """Set climate device temperature."""
+        await self._async_write(device_id, {"CH1currentSetPoint": temperature})
 
     async def set_climate_device_mode(self, device_id: str, mode: str) -> None:
-        """Set climate device mode (NOT IMPLEMENTED YET)."""
-        raise NotImplementedError("Setting mode is not implemented for IT500 yet")
+        """Set climate device mode."""
+        if (fields := IT500_MODE_FIELDS.get(mode)) is None:
+            raise ValueError(f"IT500 thermostats do not support mode {mode}")
+        await self._async_write(device_id, fields)
 
     async def set_climate_device_preset(self, device_id: str, preset: str) -> None:
-        """Set climate device preset (NOT IMPLEMENTED YET)."""
-        raise NotImplementedError("Setting preset is not implemented for IT500 yet")
+        """Set climate device preset (auto follows the schedule, manual holds)."""
+        await self._async_write(device_id, {"CH1autoOff": preset})
 
 
 # ---------------------------------------------------------------------------
 # Factory
 # ---------------------------------------------------------------------------
 
+# Modules of each gateway library, imported in the executor before first use
+GATEWAY_LIBRARIES = {
+    GATEWAY_TYPE_IT600: ("pyit600.gateway", "pyit600.exceptions"),
+    GATEWAY_TYPE_IT500: ("pyit500.auth", "pyit500.pyit500"),
+}
+
+
+async def async_import_library(hass: HomeAssistant, gateway_type: str) -> None:
+    """Import a gateway library in the executor.
+
+    The first import reads and compiles the library and its dependencies,
+    which would block the event loop; the lazy imports in the wrappers then
+    find the modules already loaded.
+    """
+    for module in GATEWAY_LIBRARIES.get(gateway_type, ()):
+        if module not in sys.modules:
+            await hass.async_add_executor_job(importlib.import_module, module)
+
 
 def create_gateway(gateway_type: str, **kwargs) -> SalusGatewayBase:
-    """Create appropriate gateway based on type."""
+    """Create appropriate gateway based on type.
+
+    With ``replay`` set to a trace file the gateway plays that trace back,
+    at ``speed`` (default 1, real time; 0 is as fast as polled). With
+    ``record`` set to a trace file, the gateway's polls and commands are
+    appended to it.
+    """
+    from .replay import RecordingGateway, ReplayGateway
+
+    gateway: SalusGatewayBase
+    if (replay := kwargs.get("replay")) is not None:
+        return ReplayGateway(replay, gateway_type, speed=kwargs.get("speed", 1.0))
     if gateway_type == GATEWAY_TYPE_IT600:
-        return IT600Gateway(
+        gateway = IT600Gateway(
             host=kwargs["host"],
             euid=kwargs["euid"],
+            port=kwargs.get("port", IT600_PORT),
         )
-    if gateway_type == GATEWAY_TYPE_IT500:
-        return IT500Gateway(
+    elif gateway_type == GATEWAY_TYPE_IT500:
+        gateway = IT500Gateway(
             username=kwargs["username"],
             password=kwargs["password"],
             device_id=kwargs["device_id"],
+            token_store=kwargs.get("token_store"),
         )
-    raise ValueError(f"Unknown gateway type: {gateway_type}")
-
+    else:
+        raise ValueError(f"Unknown gateway type: {gateway_type}")
+    if (record := kwargs.get("record")) is not None:
+        gateway = RecordingGateway(gateway, gateway_type, record)
+    return gateway
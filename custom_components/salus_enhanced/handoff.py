@@ -0,0 +1,84 @@
+"""Hand a gateway connected by the config flow over to entry setup."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from functools import partial
+import logging
+from typing import TYPE_CHECKING
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, GATEWAY_HANDOFF_TTL
+
+if TYPE_CHECKING:
+    from .gateway import SalusGatewayBase
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_HANDOFF = "gateway_handoff"
+
+
+class GatewayHandoff:
+    """A connected gateway, waiting for its entry to be set up."""
+
+    __slots__ = ("gateway", "cancel_expiry")
+
+    def __init__(self, gateway: SalusGatewayBase) -> None:
+        """Initialize the handoff."""
+        self.gateway = gateway
+        self.cancel_expiry: Callable[[], None] | None = None
+
+
+@callback
+def async_stash_gateway(
+    hass: HomeAssistant,
+    unique_id: str,
+    gateway: SalusGatewayBase,
+) -> None:
+    """Keep a connected gateway for the entry about to be created."""
+    handoffs: dict[str, GatewayHandoff] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_HANDOFF, {}
+    )
+    if (previous := handoffs.pop(unique_id, None)) is not None:
+        _async_discard(hass, previous)
+
+    handoff = handoffs[unique_id] = GatewayHandoff(gateway)
+    handoff.cancel_expiry = async_call_later(
+        hass, GATEWAY_HANDOFF_TTL, partial(_async_expire, hass, unique_id)
+    )
+
+
+@callback
+def async_claim_gateway(
+    hass: HomeAssistant, unique_id: str | None
+) -> GatewayHandoff | None:
+    """Take the gateway stashed for an entry, if it has not expired."""
+    handoffs = hass.data.get(DOMAIN, {}).get(DATA_HANDOFF, {})
+    if unique_id is None or (handoff := handoffs.pop(unique_id, None)) is None:
+        return None
+    if handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+        handoff.cancel_expiry = None
+    _LOGGER.debug("Reusing the gateway connection of the config flow for %s", unique_id)
+    return handoff
+
+
+@callback
+def _async_expire(hass: HomeAssistant, unique_id: str, _now: datetime) -> None:
+    """Close a stashed gateway that no entry setup claimed."""
+    handoffs = hass.data.get(DOMAIN, {}).get(DATA_HANDOFF, {})
+    if (handoff := handoffs.pop(unique_id, None)) is not None:
+        handoff.cancel_expiry = None
+        _async_discard(hass, handoff)
+
+
+@callback
+def _async_discard(hass: HomeAssistant, handoff: GatewayHandoff) -> None:
+    """Close the gateway of a handoff that will not be used."""
+    if handoff.cancel_expiry is not None:
+        handoff.cancel_expiry()
+    hass.async_create_background_task(
+        handoff.gateway.close(), f"{DOMAIN} close unclaimed gateway"
+    )
@@ -0,0 +1,190 @@
+"""In-memory temperature and heating history of Salus thermostats."""
+from __future__ import annotations
+
+from array import array
+from typing import Any
+
+from .const import (
+    ATTR_DUTY_CYCLE,
+    ATTR_HEATING_RATE,
+    ATTR_TIME_TO_SETPOINT,
+    HISTORY_MIN_SPAN,
+    HISTORY_SIZE,
+    HISTORY_WINDOW,
+)
+
+
+class ClimateHistory:
+    """Fixed-size ring buffer of thermostat samples with running trends.
+
+    Samples live in preallocated arrays, so a buffer always takes the same
+    memory. Samples older than ``window`` seconds are evicted as new ones
+    arrive. The sums behind the least-squares heating rate and the heating
+    time behind the duty cycle are updated on every add and evict, so
+    reading the trends does not walk the buffer.
+    """
+
+    __slots__ = (
+        "_size",
+        "_window",
+        "_time",
+        "_temperature",
+        "_setpoint",
+        "_heating",
+        "_start",
+        "_count",
+        "_origin",
+        "_sum_t",
+        "_sum_y",
+        "_sum_tt",
+        "_sum_ty",
+        "_heating_time",
+        "_adds",
+    )
+
+    def __init__(self, size: int = HISTORY_SIZE, window: float = HISTORY_WINDOW) -> None:
+        """Initialize an empty buffer."""
+        self._size = size
+        self._window = window
+        self._time = array("d", bytes(8 * size))
+        self._temperature = array("f", bytes(4 * size))
+        self._setpoint = array("f", bytes(4 * size))
+        self._heating = array("b", bytes(size))
+        self._start = 0
+        self._count = 0
+        self._origin = 0.0
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        self._heating_time = 0.0
+        self._adds = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def _index(self, position: int) -> int:
+        """Return the array index of the n-th oldest sample."""
+        return (self._start + position) % self._size
+
+    def add(
+        self, when: float, temperature: float, setpoint: float | None, heating: bool
+    ) -> None:
+        """Record a sample; ``when`` is monotonic seconds."""
+        if self._count and when <= self._time[self._index(self._count - 1)]:
+            return
+
+        while self._count and (
+            self._count == self._size or when - self._time[self._start] > self._window
+        ):
+            self._evict()
+
+        if self._count:
+            last = self._index(self._count - 1)
+            self._heating_time += self._heating[last] * (when - self._time[last])
+        else:
+            self._origin = when
+            self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+            self._heating_time = 0.0
+
+        index = self._index(self._count)
+        self._time[index] = when
+        self._temperature[index] = temperature
+        self._setpoint[index] = float("nan") if setpoint is None else setpoint
+        self._heating[index] = bool(heating)
+        self._count += 1
+        self._accumulate(index, 1)
+
+        # Rebuild the running sums now and then so rounding errors of the
+        # add/subtract pairs cannot pile up
+        self._adds += 1
+        if self._adds >= self._size:
+            self._recompute()
+
+    def _evict(self) -> None:
+        """Drop the oldest sample."""
+        index = self._start
+        if self._count > 1:
+            following = self._index(1)
+            self._heating_time -= self._heating[index] * (
+                self._time[following] - self._time[index]
+            )
+        self._accumulate(index, -1)
+        self._start = self._index(1)
+        self._count -= 1
+
+    def _accumulate(self, index: int, sign: int) -> None:
+        """Add a sample to, or remove it from, the regression sums."""
+        t = self._time[index] - self._origin
+        y = self._temperature[index]
+        self._sum_t += sign * t
+        self._sum_y += sign * y
+        self._sum_tt += sign * t * t
+        self._sum_ty += sign * t * y
+
+    def _recompute(self) -> None:
+        """Rebuild the running sums from the samples held."""
+        self._adds = 0
+        self._origin = self._time[self._start]
+        self._sum_t = self._sum_y = self._sum_tt = self._sum_ty = 0.0
+        self._heating_time = 0.0
+        previous: int | None = None
+        for position in range(self._count):
+            index = self._index(position)
+            self._accumulate(index, 1)
+            if previous is not None:
+                self._heating_time += self._heating[previous] * (
+                    self._time[index] - self._time[previous]
+                )
+            previous = index
+
+    @property
+    def span(self) -> float:
+        """Return the seconds between the oldest and newest sample."""
+        if self._count < 2:
+            return 0.0
+        return self._time[self._index(self._count - 1)] - self._time[self._start]
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the temperature trend in degrees per hour."""
+        count = self._count
+        if count < 2 or self.span < HISTORY_MIN_SPAN:
+            return None
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+        slope = (count * self._sum_ty - self._sum_t * self._sum_y) / denominator
+        return slope * 3600
+
+    @property
+    def duty_cycle(self) -> float | None:
+        """Return the share of the window spent heating, 0 to 1."""
+        if not (span := self.span) or span < HISTORY_MIN_SPAN:
+            return None
+        return self._heating_time / span
+
+    @property
+    def time_to_setpoint(self) -> float | None:
+        """Return the minutes until the setpoint is reached at the current rate."""
+        if not self._count:
+            return None
+        last = self._index(self._count - 1)
+        setpoint = self._setpoint[last]
+        if setpoint != setpoint:  # no setpoint
+            return None
+        remaining = setpoint - self._temperature[last]
+        if remaining <= 0:
+            return 0.0
+        if (rate := self.heating_rate) is None or rate <= 0:
+            return None
+        return remaining / rate * 60
+
+    def trends(self) -> dict[str, Any]:
+        """Return the trend attributes, rounded for display."""
+        attributes: dict[str, Any] = {}
+        if (rate := self.heating_rate) is not None:
+            attributes[ATTR_HEATING_RATE] = round(rate, 1)
+        if (minutes := self.time_to_setpoint) is not None:
+            attributes[ATTR_TIME_TO_SETPOINT] = round(minutes)
+        if (duty_cycle := self.duty_cycle) is not None:
+            attributes[ATTR_DUTY_CYCLE] = round(duty_cycle * 100)
+        return attributes
@@ -0,0 +1,115 @@
+"""Poll-cycle instrumentation for Salus gateways."""
+from __future__ import annotations
+
+from collections import deque
+from typing import Any
+
+from .const import METRICS_WINDOW
+
+# Timed phases of a poll cycle; "loop" is the time parsing and normalizing
+# blocked the event loop
+PHASES = ("connect", "request", "parse", "normalize", "loop", "total")
+
+
+class RollingStats:
+    """Last values of a measurement, with percentiles computed on demand."""
+
+    __slots__ = ("_values", "_summary")
+
+    def __init__(self, size: int = METRICS_WINDOW) -> None:
+        """Initialize the window."""
+        self._values: deque[float] = deque(maxlen=size)
+        self._summary: dict[str, float | None] | None = None
+
+    def add(self, value: float) -> None:
+        """Record a value."""
+        self._values.append(value)
+        self._summary = None
+
+    @property
+    def last(self) -> float | None:
+        """Return the latest value."""
+        return self._values[-1] if self._values else None
+
+    def summary(self) -> dict[str, float | None]:
+        """Return the latest value and the p50/p95/p99 of the window."""
+        if self._summary is None:
+            values = sorted(self._values)
+            count = len(values)
+
+            def percentile(rank: float) -> float | None:
+                if not count:
+                    return None
+                return values[min(count - 1, int(rank * count))]
+
+            self._summary = {
+                "last": self.last,
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+            }
+        return self._summary
+
+
+class PollMetrics:
+    """Timings, sizes and error counts of the recent poll cycles.
+
+    Recording only appends to fixed-size windows; percentiles are computed
+    when read, at most once per recorded poll.
+    """
+
+    def __init__(self, window: int = METRICS_WINDOW) -> None:
+        """Initialize the metrics."""
+        self.timings = {phase: RollingStats(window) for phase in PHASES}
+        self.payload_size = RollingStats(window)
+        self.changed_count = RollingStats(window)
+        self.device_count = 0
+        self.polls = 0
+        self.executed = 0
+        self.deduplicated = 0
+        self.errors = 0
+        self.last_error: str | None = None
+
+    def record_poll(
+        self,
+        timings: dict[str, float],
+        payload_size: int | None,
+        device_count: int,
+        changed_count: int,
+    ) -> None:
+        """Record a successful poll; timings are in seconds."""
+        self.polls += 1
+        for phase, seconds in timings.items():
+            self.timings[phase].add(round(seconds * 1000, 3))
+        if payload_size is not None:
+            self.payload_size.add(payload_size)
+        self.device_count = device_count
+        self.changed_count.add(changed_count)
+
+    def record_refresh(self, joined: bool) -> None:
+        """Record a refresh request, run as its own poll or joined to another."""
+        if joined:
+            self.deduplicated += 1
+        else:
+            self.executed += 1
+
+    def record_error(self, err: Exception) -> None:
+        """Record a failed poll."""
+        self.errors += 1
+        self.last_error = f"{type(err).__name__}: {err}"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics; timings are in milliseconds."""
+        return {
+            "polls": self.polls,
+            "polls_executed": self.executed,
+            "polls_deduplicated": self.deduplicated,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "device_count": self.device_count,
+            "changed_count": self.changed_count.summary(),
+            "payload_size": self.payload_size.summary(),
+            "timings_ms": {
+                phase: stats.summary() for phase, stats in self.timings.items()
+            },
+        }
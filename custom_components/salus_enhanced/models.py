@@ -0,0 +1,232 @@
+"""Per-device state records for Salus devices.
+
+The gateway wrappers build one record per device on every poll, with values
+already converted to what the entities expose, so entities only hold a
+reference to their record instead of walking the snapshot dict.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.climate import HVACAction, HVACMode
+
+
+class DeviceState:
+    """Base class for device state records."""
+
+    __slots__ = ("device_id", "name", "model", "available")
+
+    # All slot names, base class first; extended by __init_subclass__.
+    _fields: tuple[str, ...] = __slots__
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+    ) -> None:
+        """Initialize the record."""
+        self.device_id = device_id
+        self.name = name
+        self.model = model
+        self.available = available
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Collect the slot names of the subclass."""
+        super().__init_subclass__(**kwargs)
+        cls._fields = cls._fields + cls.__dict__.get("__slots__", ())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record as a plain dict."""
+        return {name: getattr(self, name) for name in self._fields}
+
+    def to_row(self) -> list[Any]:
+        """Return the field values, in slot order, for compact storage."""
+        return [getattr(self, name) for name in self._fields]
+
+    @classmethod
+    def from_row(cls, row: list[Any]) -> DeviceState:
+        """Rebuild a record from a stored row."""
+        if len(row) != len(cls._fields):
+            raise ValueError(f"Stored {cls.__name__} row has the wrong length")
+        record = object.__new__(cls)
+        for name, value in zip(cls._fields, row):
+            setattr(record, name, value)
+        return record
+
+    def replace(self, **changes: Any) -> DeviceState:
+        """Return a copy of the record with some fields changed."""
+        clone = object.__new__(self.__class__)
+        for name in self._fields:
+            setattr(clone, name, changes[name] if name in changes else getattr(self, name))
+        return clone
+
+    def __eq__(self, other: object) -> bool:
+        """Compare two records field by field."""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name) for name in self._fields
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return a debug representation."""
+        return f"{type(self).__name__}({self.as_dict()!r})"
+
+
+class ClimateState(DeviceState):
+    """State of a thermostat."""
+
+    __slots__ = (
+        "current_temperature",
+        "target_temperature",
+        "min_temp",
+        "max_temp",
+        "hvac_mode",
+        "hvac_action",
+        "preset_mode",
+        "is_heating",
+        "humidity",
+        "battery",
+        "window_open",
+    )
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+        current_temperature: float | None = None,
+        target_temperature: float | None = None,
+        min_temp: float | None = None,
+        max_temp: float | None = None,
+        hvac_mode: HVACMode = HVACMode.OFF,
+        hvac_action: HVACAction | None = None,
+        preset_mode: str | None = None,
+        is_heating: bool = False,
+        humidity: float | None = None,
+        battery: int | None = None,
+        window_open: bool | None = None,
+    ) -> None:
+        """Initialize the record."""
+        super().__init__(device_id, name, model, available)
+        self.current_temperature = current_temperature
+        self.target_temperature = target_temperature
+        self.min_temp = min_temp
+        self.max_temp = max_temp
+        self.hvac_mode = hvac_mode
+        self.hvac_action = hvac_action
+        self.preset_mode = preset_mode
+        self.is_heating = is_heating
+        self.humidity = humidity
+        self.battery = battery
+        self.window_open = window_open
+
+    @classmethod
+    def from_row(cls, row: list[Any]) -> ClimateState:
+        """Rebuild a record from a stored row, restoring the enums."""
+        record = super().from_row(row)
+        record.hvac_mode = HVACMode(record.hvac_mode)
+        if record.hvac_action is not None:
+            record.hvac_action = HVACAction(record.hvac_action)
+        return record
+
+
+class BinarySensorState(DeviceState):
+    """State of a binary sensor."""
+
+    __slots__ = ("is_on", "device_class")
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+        is_on: bool | None = None,
+        device_class: str | None = None,
+    ) -> None:
+        """Initialize the record."""
+        super().__init__(device_id, name, model, available)
+        self.is_on = is_on
+        self.device_class = device_class
+
+
+class SensorState(DeviceState):
+    """State of a sensor."""
+
+    __slots__ = ("native_value", "unit_of_measurement", "device_class")
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+        native_value: Any = None,
+        unit_of_measurement: str | None = None,
+        device_class: str | None = None,
+    ) -> None:
+        """Initialize the record."""
+        super().__init__(device_id, name, model, available)
+        self.native_value = native_value
+        self.unit_of_measurement = unit_of_measurement
+        self.device_class = device_class
+
+
+class SwitchState(DeviceState):
+    """State of a switch."""
+
+    __slots__ = ("is_on", "device_class")
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+        is_on: bool | None = None,
+        device_class: str | None = None,
+    ) -> None:
+        """Initialize the record."""
+        super().__init__(device_id, name, model, available)
+        self.is_on = is_on
+        self.device_class = device_class
+
+
+class CoverState(DeviceState):
+    """State of a cover."""
+
+    __slots__ = ("current_position", "is_opening", "is_closing", "is_closed")
+
+    def __init__(
+        self,
+        device_id: str,
+        name: str | None = None,
+        model: str | None = None,
+        available: bool = True,
+        current_position: int | None = None,
+        is_opening: bool | None = None,
+        is_closing: bool | None = None,
+        is_closed: bool | None = None,
+    ) -> None:
+        """Initialize the record."""
+        super().__init__(device_id, name, model, available)
+        self.current_position = current_position
+        self.is_opening = is_opening
+        self.is_closing = is_closing
+        self.is_closed = is_closed
+
+
+# Record type of each snapshot category
+STATE_TYPES: dict[str, type[DeviceState]] = {
+    "climate": ClimateState,
+    "binary_sensor": BinarySensorState,
+    "sensor": SensorState,
+    "switch": SwitchState,
+    "cover": CoverState,
+}
@@ -0,0 +1,240 @@
+"""Rate-limited, prioritized queue for requests to a cloud service."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, TypeVar
+
+from .metrics import RollingStats
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+# HTTP statuses a cloud answers with when it throttles a client
+THROTTLE_STATUSES = (429, 503)
+
+# Share of the configured rate won back after every successful request
+RATE_RECOVERY_STEP = 0.05
+
+
+def _retry_after(err: Exception) -> float | None:
+    """Return the Retry-After seconds of a throttling error, if it has them."""
+    headers = getattr(err, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttled(err: Exception) -> bool:
+    """Return True if an error is the cloud throttling the client."""
+    return getattr(err, "status", None) in THROTTLE_STATUSES
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``."""
+
+    __slots__ = ("rate", "capacity", "tokens", "_updated", "_clock")
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize a full bucket."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill."""
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_take(self) -> bool:
+        """Take a token if one is available."""
+        self._refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def wait_time(self) -> float:
+        """Return the seconds until a token is available."""
+        self._refill()
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def drain(self) -> None:
+        """Drop the tokens saved up."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class CloudRequestQueue:
+    """Queue shared by every request of the process to one cloud service.
+
+    Requests wait in a priority queue, lowest value first and in order
+    within a priority, and are started as a token bucket allows, at most
+    ``max_concurrency`` at a time. A throttling response halves the rate,
+    pauses the queue for its Retry-After time (``throttle_pause`` if it has
+    none) and queues the request again, up to ``retries`` times. Every
+    successful request wins back a little of the configured rate.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_concurrency: int,
+        min_rate: float,
+        throttle_pause: float,
+        retries: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the queue."""
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_concurrency = max_concurrency
+        self.throttle_pause = throttle_pause
+        self.retries = retries
+        self._clock = clock
+        self._bucket = TokenBucket(rate, burst, clock)
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self.wait_ms = RollingStats()
+        self.max_queue_depth = 0
+        self.request_count = 0
+        self.throttled_count = 0
+
+    async def async_call(
+        self, priority: int, method: Callable[..., Awaitable[_T]], *args: Any
+    ) -> _T:
+        """Wait for a turn, then return ``await method(*args)``."""
+        # retries after throttling are counted as throttled, not as requests
+        self.request_count += 1
+        attempt = 0
+        while True:
+            await self._async_acquire(priority)
+            try:
+                result = await method(*args)
+            except Exception as err:
+                if not is_throttled(err) or attempt >= self.retries:
+                    raise
+                attempt += 1
+                self._throttled(err)
+                continue
+            finally:
+                self._in_flight -= 1
+                self._dispatch()
+            self._bucket.rate = min(
+                self.rate, self._bucket.rate + self.rate * RATE_RECOVERY_STEP
+            )
+            return result
+
+    def _can_start(self) -> bool:
+        """Return True if a request may start now, taking its token."""
+        return (
+            self._in_flight < self.max_concurrency
+            and self._clock() >= self._paused_until
+            and self._bucket.try_take()
+        )
+
+    async def _async_acquire(self, priority: int) -> None:
+        """Wait until a request of this priority may start."""
+        if not self._queue and self._can_start():
+            self._in_flight += 1
+            self.wait_ms.add(0.0)
+            return
+
+        started = self._clock()
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._sequence), future))
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # cancelled after being let through: hand the turn on
+                self._in_flight -= 1
+                self._dispatch()
+            raise
+        self.wait_ms.add(round((self._clock() - started) * 1000, 3))
+
+    def _dispatch(self) -> None:
+        """Let queued requests through while the limits allow it."""
+        queue = self._queue
+        while queue:
+            future = queue[0][2]
+            if future.done():
+                heapq.heappop(queue)
+                continue
+            if not self._can_start():
+                break
+            heapq.heappop(queue)
+            self._in_flight += 1
+            future.set_result(None)
+
+        if queue and self._timer is None and self._in_flight < self.max_concurrency:
+            delay = max(
+                self._paused_until - self._clock(), self._bucket.wait_time(), 0.0
+            )
+            self._timer = asyncio.get_running_loop().call_later(
+                delay, self._on_timer
+            )
+
+    def _on_timer(self) -> None:
+        """Retry the queue once a token is due or a pause ended."""
+        self._timer = None
+        self._dispatch()
+
+    def _throttled(self, err: Exception) -> None:
+        """Slow down after the cloud throttled a request."""
+        self.throttled_count += 1
+        if self._clock() >= self._paused_until:
+            # the other requests of the same burst do not slow down further
+            self._bucket.rate = max(self.min_rate, self._bucket.rate / 2)
+        self._bucket.drain()
+        pause = _retry_after(err)
+        if pause is None:
+            pause = self.throttle_pause
+        self._paused_until = max(self._paused_until, self._clock() + pause)
+        _LOGGER.debug(
+            "Cloud throttled a request (%s); pausing %.0f s, rate now %.2f/s",
+            err,
+            pause,
+            self._bucket.rate,
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        """Return the number of requests waiting."""
+        return sum(1 for _, _, future in self._queue if not future.done())
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the state and counters of the queue."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._in_flight,
+            "rate": round(self._bucket.rate, 3),
+            "configured_rate": self.rate,
+            "paused_for": round(max(0.0, self._paused_until - self._clock()), 1),
+            "requests": self.request_count,
+            "throttled": self.throttled_count,
+            "wait_ms": self.wait_ms.summary(),
+        }
@@ -0,0 +1,413 @@
+"""Record and replay the traffic of a Salus gateway.
+
+A trace is a file of JSON lines, appended to while recording:
+
+- ``["start", version, gateway_type, wall_time]`` opens a recording session
+- ``["poll", t, delta]`` is a snapshot returned by poll_status
+- ``["push", t, delta]`` is a snapshot pushed through the update callback
+- ``["error", t, message]`` is a failed poll
+- ``["command", t, name, args]`` is a command sent to a device
+
+``t`` is the seconds since the session started. A delta holds, per
+category, the storage rows of the devices that changed since the previous
+snapshot of the session, and null for removed devices; the first snapshot
+of a session holds every device.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from .const import TRACE_VERSION
+from .gateway import SalusGatewayBase
+from .models import STATE_TYPES
+
+_LOGGER = logging.getLogger(__name__)
+
+# Gateway methods that send a command to a device
+GATEWAY_COMMANDS = (
+    "set_climate_device_temperature",
+    "set_climate_device_mode",
+    "set_climate_device_preset",
+    "turn_on_switch_device",
+    "turn_off_switch_device",
+    "open_cover_device",
+    "close_cover_device",
+    "set_cover_position",
+)
+
+
+class RecordedError(Exception):
+    """Error of a recorded poll, raised again on replay."""
+
+
+def _delta(
+    previous: dict[str, dict[str, Any]], current: dict[str, dict[str, Any]]
+) -> dict[str, dict[str, list[Any] | None]]:
+    """Return the rows of the devices that changed between two snapshots."""
+    delta: dict[str, dict[str, list[Any] | None]] = {}
+    for category in previous.keys() | current.keys():
+        old_devices = previous.get(category) or {}
+        new_devices = current.get(category) or {}
+        rows: dict[str, list[Any] | None] = {
+            device_id: None for device_id in old_devices.keys() - new_devices.keys()
+        }
+        for device_id, device in new_devices.items():
+            if old_devices.get(device_id) != device:
+                rows[device_id] = device.to_row()
+        if rows:
+            delta[category] = rows
+    return delta
+
+
+def _dumps(line: list[Any]) -> str:
+    """Return a trace line."""
+    return json.dumps(line, separators=(",", ":")) + "\n"
+
+
+def _append(path: str, lines: list[str]) -> None:
+    """Append lines to a trace file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.writelines(lines)
+
+
+class RecordingGateway(SalusGatewayBase):
+    """Gateway wrapper that appends every poll and command to a trace.
+
+    Lines are buffered and written in the executor in the background, so
+    recording adds no file I/O to the poll itself.
+    """
+
+    def __init__(
+        self, gateway: SalusGatewayBase, gateway_type: str, path: str
+    ) -> None:
+        """Initialize the recorder."""
+        self._gateway = gateway
+        self._gateway_type = gateway_type
+        self._path = path
+        self._started: float | None = None
+        self._recorded: dict[str, dict[str, Any]] = {}
+        self._lines: list[str] = []
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def gateway(self) -> SalusGatewayBase:
+        """Return the recorded gateway."""
+        return self._gateway
+
+    def _record(self, kind: str, *values: Any) -> None:
+        """Buffer a trace line and schedule writing it."""
+        if self._started is None:
+            self._started = time.monotonic()
+            self._lines.append(
+                _dumps(["start", TRACE_VERSION, self._gateway_type, time.time()])
+            )
+        when = round(time.monotonic() - self._started, 3)
+        self._lines.append(_dumps([kind, when, *values]))
+        if self._flush_task is None:
+            self._flush_task = asyncio.get_running_loop().create_task(
+                self._async_flush()
+            )
+
+    def _record_snapshot(self, kind: str, data: dict[str, dict[str, Any]]) -> None:
+        """Buffer the devices of a snapshot that changed since the last one."""
+        self._record(kind, _delta(self._recorded, data))
+        self._recorded = data
+
+    async def _async_flush(self) -> None:
+        """Write the buffered lines until none are left."""
+        loop = asyncio.get_running_loop()
+        try:
+            while self._lines:
+                lines, self._lines = self._lines, []
+                try:
+                    await loop.run_in_executor(None, _append, self._path, lines)
+                except OSError as err:
+                    _LOGGER.warning("Cannot write trace %s: %s", self._path, err)
+        finally:
+            self._flush_task = None
+
+    async def connect(self) -> None:
+        """Connect the recorded gateway."""
+        await self._gateway.connect()
+
+    async def reconnect(self) -> None:
+        """Reconnect the recorded gateway."""
+        await self._gateway.reconnect()
+
+    async def poll_status(self) -> dict[str, Any]:
+        """Poll the recorded gateway and record the result."""
+        try:
+            data = await self._gateway.poll_status()
+        except Exception as err:
+            self._record("error", f"{type(err).__name__}: {err}")
+            raise
+        self._record_snapshot("poll", data)
+        return data
+
+    async def close(self) -> None:
+        """Close the recorded gateway and write what is left of the trace."""
+        await self._gateway.close()
+        if self._flush_task is not None:
+            await self._flush_task
+
+    def set_update_callback(
+        self, update_callback: Callable[[dict[str, Any]], None] | None
+    ) -> None:
+        """Record the snapshots pushed by the recorded gateway."""
+        if update_callback is None:
+            self._gateway.set_update_callback(None)
+            return
+
+        def pushed(data: dict[str, Any]) -> None:
+            self._record_snapshot("push", data)
+            update_callback(data)
+
+        self._gateway.set_update_callback(pushed)
+
+    def __getattr__(self, name: str) -> Any:
+        """Return the recorded gateway's command methods, recording each call."""
+        if name not in GATEWAY_COMMANDS:
+            raise AttributeError(name)
+        command = getattr(self._gateway, name)
+
+        async def record_command(*args: Any) -> Any:
+            self._record("command", name, list(args))
+            return await command(*args)
+
+        return record_command
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return the connection counters of the recorded gateway."""
+        return self._gateway.connection_stats
+
+    @property
+    def poll_tiers(self) -> dict[str, dict[str, float | None]]:
+        """Return the poll tiers of the recorded gateway."""
+        return self._gateway.poll_tiers
+
+    @property
+    def request_queue_stats(self) -> dict[str, Any]:
+        """Return the request queue state of the recorded gateway."""
+        return self._gateway.request_queue_stats
+
+    @property
+    def last_poll_stats(self) -> dict[str, float]:  # type: ignore[override]
+        """Return the phase timings of the recorded gateway's last poll."""
+        return self._gateway.last_poll_stats
+
+    def get_climate_devices(self) -> dict[str, Any]:
+        """Get climate devices."""
+        return self._gateway.get_climate_devices()
+
+    def get_binary_sensor_devices(self) -> dict[str, Any]:
+        """Get binary sensor devices."""
+        return self._gateway.get_binary_sensor_devices()
+
+    def get_sensor_devices(self) -> dict[str, Any]:
+        """Get sensor devices."""
+        return self._gateway.get_sensor_devices()
+
+    def get_switch_devices(self) -> dict[str, Any]:
+        """Get switch devices."""
+        return self._gateway.get_switch_devices()
+
+    def get_cover_devices(self) -> dict[str, Any]:
+        """Get cover devices."""
+        return self._gateway.get_cover_devices()
+
+
+class _TraceEvent:
+    """A recorded snapshot or error, on the replay timeline."""
+
+    __slots__ = ("time", "kind", "payload", "full")
+
+    def __init__(self, when: float, kind: str, payload: Any, full: bool) -> None:
+        """Initialize the event."""
+        self.time = when
+        self.kind = kind
+        self.payload = payload
+        self.full = full
+
+
+def load_trace(
+    path: str, gateway_type: str
+) -> tuple[list[_TraceEvent], list[tuple[float, str, list[Any]]]]:
+    """Read a trace into its snapshot events and its commands.
+
+    Sessions are laid end to end on one timeline. Blocking; run it in the
+    executor.
+    """
+    events: list[_TraceEvent] = []
+    commands: list[tuple[float, str, list[Any]]] = []
+    offset = end = 0.0
+    full = False
+    with open(path, encoding="utf-8") as file:
+        for number, line in enumerate(file, 1):
+            try:
+                kind, *values = json.loads(line)
+            except ValueError as err:
+                raise ValueError(f"{path}:{number}: {err}") from err
+            if kind == "start":
+                version, recorded_type = values[0], values[1]
+                if version != TRACE_VERSION or recorded_type != gateway_type:
+                    raise ValueError(
+                        f"{path}:{number}: trace of {recorded_type} version"
+                        f" {version}, expected {gateway_type} version {TRACE_VERSION}"
+                    )
+                offset = end
+                full = True
+                continue
+            when = offset + values[0]
+            end = max(end, when)
+            if kind == "command":
+                commands.append((when, values[1], values[2]))
+            elif kind in ("poll", "push", "error"):
+                events.append(_TraceEvent(when, kind, values[1], full))
+                full = full and kind == "error"
+    return events, commands
+
+
+class ReplayGateway(SalusGatewayBase):
+    """Gateway that plays back the snapshots of a recorded trace.
+
+    At ``speed`` 1 every poll returns the state the recorded gateway was in
+    at the same time into the recording; higher speeds play faster. With a
+    speed of 0 every poll returns the next recorded snapshot, as fast as
+    polls come. Recorded errors are raised as RecordedError. With ``loop``
+    the trace starts over once it ends. Commands are accepted and counted
+    but change nothing.
+    """
+
+    def __init__(
+        self, path: str, gateway_type: str, speed: float = 1.0, loop: bool = True
+    ) -> None:
+        """Initialize the replay."""
+        self._path = path
+        self._gateway_type = gateway_type
+        self.speed = speed
+        self.loop = loop
+        self._events: list[_TraceEvent] | None = None
+        self.recorded_commands: list[tuple[float, str, list[Any]]] = []
+        self._position = 0
+        self._started = 0.0
+        self._data: dict[str, dict[str, Any]] = {}
+        self.commands_received = 0
+        self.rounds = 0
+
+    async def connect(self) -> None:
+        """Load the trace and start playing it."""
+        if self._events is None:
+            self._events, self.recorded_commands = (
+                await asyncio.get_running_loop().run_in_executor(
+                    None, load_trace, self._path, self._gateway_type
+                )
+            )
+            if not self._events:
+                raise ValueError(f"{self._path} holds no snapshots")
+        self._started = time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        """Return True once a trace that does not loop was played."""
+        return self._events is not None and self._position >= len(self._events)
+
+    async def poll_status(self) -> dict[str, Any]:
+        """Return the recorded state at the current point of the replay."""
+        if (events := self._events) is None:
+            raise RuntimeError("Replay gateway not connected")
+
+        if self.loop and self._position >= len(events):
+            self._position = 0
+            self._started = time.monotonic()
+            self.rounds += 1
+
+        if self.speed > 0:
+            # the first poll of a round always gets the first snapshot
+            now = max(
+                (time.monotonic() - self._started) * self.speed, events[0].time
+            )
+            last: _TraceEvent | None = None
+            while self._position < len(events) and events[self._position].time <= now:
+                last = events[self._position]
+                self._apply(last)
+                self._position += 1
+        elif self._position < len(events):
+            last = events[self._position]
+            self._apply(last)
+            self._position += 1
+        else:
+            last = None
+
+        if last is not None and last.kind == "error":
+            raise RecordedError(last.payload)
+        return self._data
+
+    def _apply(self, event: _TraceEvent) -> None:
+        """Apply the delta of a recorded snapshot to the replayed state."""
+        if event.kind == "error":
+            return
+        if event.full:
+            data: dict[str, dict[str, Any]] = {category: {} for category in STATE_TYPES}
+        else:
+            data = dict(self._data)
+        for category, rows in event.payload.items():
+            state_type = STATE_TYPES[category]
+            devices = dict(data.get(category, {}))
+            for device_id, row in rows.items():
+                if row is None:
+                    devices.pop(device_id, None)
+                else:
+                    devices[device_id] = state_type.from_row(row)
+            data[category] = devices
+        self._data = data
+
+    async def close(self) -> None:
+        """Stop the replay."""
+
+    def __getattr__(self, name: str) -> Any:
+        """Return a command method that only counts the call."""
+        if name not in GATEWAY_COMMANDS:
+            raise AttributeError(name)
+
+        async def receive_command(*args: Any) -> None:
+            self.commands_received += 1
+            _LOGGER.debug("Replay gateway ignores %s%s", name, args)
+
+        return receive_command
+
+    @property
+    def connection_stats(self) -> dict[str, int]:
+        """Return the replay progress."""
+        return {
+            "replayed": self._position,
+            "rounds": self.rounds,
+            "commands_received": self.commands_received,
+        }
+
+    def get_climate_devices(self) -> dict[str, Any]:
+        """Get climate devices."""
+        return self._data.get("climate", {})
+
+    def get_binary_sensor_devices(self) -> dict[str, Any]:
+        """Get binary sensor devices."""
+        return self._data.get("binary_sensor", {})
+
+    def get_sensor_devices(self) -> dict[str, Any]:
+        """Get sensor devices."""
+        return self._data.get("sensor", {})
+
+    def get_switch_devices(self) -> dict[str, Any]:
+        """Get switch devices."""
+        return self._data.get("switch", {})
+
+    def get_cover_devices(self) -> dict[str, Any]:
+        """Get cover devices."""
+        return self._data.get("cover", {})
@@ -0,0 +1,198 @@
+"""Reconnecting session layer around Salus gateways."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+import random
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_OPEN_TIME,
+    RECONNECT_BACKOFF_MAX,
+    RECONNECT_BACKOFF_MIN,
+    RECONNECT_JITTER,
+)
+from .gateway import SalusGatewayBase
+
+_LOGGER = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class GatewayUnavailable(Exception):
+    """The gateway is being reconnected; no request was made."""
+
+
+class CircuitBreaker:
+    """Stop calling a gateway that keeps failing.
+
+    After ``threshold`` failures in a row the circuit opens for
+    ``open_time`` seconds. Then it is half open: one call is let through,
+    and its failure opens the circuit again right away.
+    """
+
+    def __init__(
+        self,
+        threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        open_time: float = CIRCUIT_OPEN_TIME,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the breaker."""
+        self._threshold = threshold
+        self._open_time = open_time
+        self._clock = clock
+        self._opened_at: float | None = None
+        self.failures = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._opened_at is None:
+            return CIRCUIT_CLOSED
+        if self._clock() < self._opened_at + self._open_time:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
+    def retry_in(self) -> float:
+        """Return the seconds until a call is allowed again."""
+        if self._opened_at is None:
+            return 0.0
+        return max(0.0, self._opened_at + self._open_time - self._clock())
+
+    def record_success(self) -> None:
+        """Close the circuit."""
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit if there were too many."""
+        self.failures += 1
+        if self._opened_at is not None or self.failures >= self._threshold:
+            if self.state != CIRCUIT_OPEN:
+                self.trips += 1
+            self._opened_at = self._clock()
+
+
+class GatewaySession:
+    """Keeps a gateway connected, reconnecting in the background.
+
+    A failed poll marks the session disconnected and starts a reconnect
+    loop with exponential backoff and jitter, guarded by a circuit breaker.
+    Polls made while it runs raise GatewayUnavailable without touching the
+    gateway; ``on_reconnect`` is called once it is connected again.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        gateway: SalusGatewayBase,
+        name: str,
+        connected: bool = False,
+        on_reconnect: Callable[[], None] | None = None,
+    ) -> None:
+        """Initialize the session."""
+        self._hass = hass
+        self.gateway = gateway
+        self._name = name
+        self._on_reconnect = on_reconnect
+        self.connected = connected
+        self.breaker = CircuitBreaker()
+        self.reconnects = 0
+        self.last_error: str | None = None
+        self.last_connect_time: float | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+
+    async def async_poll(self) -> dict[str, Any]:
+        """Poll the gateway, connecting it first if needed."""
+        self.last_connect_time = None
+        if not self.connected:
+            if self._reconnect_task is not None:
+                raise GatewayUnavailable(f"reconnecting ({self.last_error})")
+            started = time.perf_counter()
+            try:
+                await self.gateway.connect()
+            except Exception as err:
+                self._async_failed(err)
+                raise
+            self.connected = True
+            self.last_connect_time = time.perf_counter() - started
+
+        try:
+            data = await self.gateway.poll_status()
+        except Exception as err:
+            self._async_failed(err)
+            raise
+        self.breaker.record_success()
+        return data
+
+    @callback
+    def _async_failed(self, err: Exception) -> None:
+        """Mark the session disconnected and start reconnecting."""
+        self.connected = False
+        self.last_error = f"{type(err).__name__}: {err}"
+        self.breaker.record_failure()
+        if self._reconnect_task is None:
+            self._reconnect_task = self._hass.async_create_background_task(
+                self._async_reconnect(), f"{self._name} reconnect"
+            )
+
+    async def _async_reconnect(self) -> None:
+        """Reconnect with exponential backoff until it works."""
+        attempt = 0
+        try:
+            while True:
+                delay = min(
+                    RECONNECT_BACKOFF_MAX, RECONNECT_BACKOFF_MIN * 2**attempt
+                ) * random.uniform(1 - RECONNECT_JITTER, 1 + RECONNECT_JITTER)
+                await asyncio.sleep(max(delay, self.breaker.retry_in()))
+                attempt += 1
+                try:
+                    await self.gateway.reconnect()
+                except Exception as err:  # noqa: BLE001
+                    self.last_error = f"{type(err).__name__}: {err}"
+                    self.breaker.record_failure()
+                    _LOGGER.debug(
+                        "%s: reconnect attempt %d failed: %s, circuit %s",
+                        self._name,
+                        attempt,
+                        err,
+                        self.breaker.state,
+                    )
+                    continue
+                break
+        finally:
+            self._reconnect_task = None
+
+        self.breaker.record_success()
+        self.connected = True
+        self.reconnects += 1
+        _LOGGER.info("%s: reconnected after %d attempt(s)", self._name, attempt)
+        if self._on_reconnect is not None:
+            self._on_reconnect()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop reconnecting."""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the session state for diagnostics."""
+        return {
+            "connected": self.connected,
+            "reconnecting": self._reconnect_task is not None,
+            "reconnects": self.reconnects,
+            "circuit": self.breaker.state,
+            "circuit_trips": self.breaker.trips,
+            "failures_in_a_row": self.breaker.failures,
+            "reconnect_error": self.last_error,
+        }
@@ -0,0 +1,170 @@
+"""Adaptive poll interval scheduling for Salus gateways."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+import time
+from typing import Any
+
+from .const import FAST_POLL_WINDOW, POLL_HISTORY
+
+
+class AdaptivePollScheduler:
+    """Pick the next poll interval from recent activity.
+
+    - errors back off exponentially from the baseline up to the ceiling;
+    - for ``fast_window`` seconds after a command, or after a change that
+      follows a quiet poll, the floor interval is used;
+    - otherwise the interval stays at the baseline while devices keep
+      changing and grows by half for every consecutive quiet poll, up to
+      the ceiling.
+    """
+
+    def __init__(
+        self,
+        min_interval: float,
+        base_interval: float,
+        max_interval: float,
+        fast_window: float = FAST_POLL_WINDOW,
+        history: int = POLL_HISTORY,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the scheduler."""
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self._fast_window = fast_window
+        self._clock = clock
+        self._recent_changes: deque[int] = deque(maxlen=history)
+        self._fast_until = 0.0
+        self._errors = 0
+        self._interval = base_interval
+
+    @property
+    def current_interval(self) -> timedelta:
+        """Return the interval the next poll will use."""
+        return timedelta(seconds=self._interval)
+
+    @property
+    def consecutive_errors(self) -> int:
+        """Return the number of polls that failed in a row."""
+        return self._errors
+
+    def record_poll(self, changed_count: int) -> timedelta:
+        """Record a successful poll and return the next interval."""
+        previous_quiet = not self._recent_changes or self._recent_changes[-1] == 0
+        self._errors = 0
+        self._recent_changes.append(changed_count)
+        if changed_count and previous_quiet:
+            self._fast_until = self._clock() + self._fast_window
+        return self._update()
+
+    def record_command(self) -> timedelta:
+        """Record a command sent to a device and return the next interval."""
+        self._fast_until = self._clock() + self._fast_window
+        return self._update()
+
+    def record_error(self) -> timedelta:
+        """Record a failed poll and return the next interval."""
+        self._errors += 1
+        return self._update()
+
+    def _update(self) -> timedelta:
+        """Recompute the interval."""
+        self._interval = self._compute()
+        return self.current_interval
+
+    def _compute(self) -> float:
+        """Return the interval for the current state, in seconds."""
+        if self._errors:
+            return min(
+                self.max_interval, self.base_interval * 2 ** min(self._errors, 10)
+            )
+
+        if self._clock() < self._fast_until:
+            return self.min_interval
+
+        quiet_polls = 0
+        for changed in reversed(self._recent_changes):
+            if changed:
+                break
+            quiet_polls += 1
+
+        if not quiet_polls:
+            return self.base_interval
+
+        return min(self.max_interval, self.base_interval * 1.5**quiet_polls)
+
+
+def slot_phase(slot: int) -> float:
+    """Return the phase of a slot: 0, 1/2, 1/4, 3/4, 1/8, 5/8, ...
+
+    This is the base-2 van der Corput sequence. Any two of its first n
+    points are at least 1 / (2 * n) apart.
+    """
+    phase = 0.0
+    weight = 0.5
+    while slot:
+        if slot & 1:
+            phase += weight
+        slot >>= 1
+        weight /= 2
+    return phase
+
+
+class PollPhases:
+    """Stable phase offsets that spread the polls of all gateways.
+
+    Each gateway takes the lowest free slot and keeps it while other
+    gateways come and go, so n gateways on slots 0 to n - 1 poll at least
+    1 / (2 * n) of the interval apart. Entries sharing a gateway (IT500
+    entries of one account) share its slot. Gateways configured when the
+    first entry is set up take their slots in key order, so the phases
+    after a restart do not depend on which entry finishes setting up first.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without any slot taken."""
+        self._slots: dict[str, int] = {}
+        self._entries: dict[str, str] = {}
+
+    def reserve(self, keys: Iterable[str]) -> None:
+        """Give slots to the given gateways, in key order."""
+        for key in sorted(set(keys)):
+            self._take(key)
+
+    def assign(self, entry_id: str, key: str) -> float:
+        """Return the phase of an entry's gateway, taking a slot if needed."""
+        self._entries[entry_id] = key
+        return slot_phase(self._take(key))
+
+    def release(self, entry_id: str) -> None:
+        """Free the slot of an entry's gateway once no entry uses it."""
+        if (key := self._entries.pop(entry_id, None)) is not None and (
+            key not in self._entries.values()
+        ):
+            self._slots.pop(key, None)
+
+    def _take(self, key: str) -> int:
+        """Return the slot of a gateway, taking the lowest free one if needed."""
+        if (slot := self._slots.get(key)) is None:
+            taken = set(self._slots.values())
+            slot = next(index for index in range(len(taken) + 1) if index not in taken)
+            self._slots[key] = slot
+        return slot
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the slot, phase and entries of every gateway in use."""
+        gateways: dict[str, dict[str, Any]] = {}
+        for entry_id, key in self._entries.items():
+            gateway = gateways.setdefault(
+                key,
+                {
+                    "slot": self._slots[key],
+                    "phase": slot_phase(self._slots[key]),
+                    "entries": [],
+                },
+            )
+            gateway["entries"].append(entry_id)
+        return gateways
@@ -0,0 +1,192 @@
+"""Support for Salus sensors."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import SalusDataUpdateCoordinator
+from .entity import SalusEntity
+from .models import SensorState
+
+# pyit600 reports units as display strings
+UNITS = {
+    "°C": UnitOfTemperature.CELSIUS,
+    "°F": UnitOfTemperature.FAHRENHEIT,
+}
+
+
+@dataclass(frozen=True)
+class SalusPollSensorDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of the gateway's poll cycle."""
+
+    value_fn: Callable[[SalusDataUpdateCoordinator], Any] = lambda _: None
+    attributes_fn: Callable[[SalusDataUpdateCoordinator], dict[str, Any]] = (
+        lambda _: {}
+    )
+
+
+POLL_SENSORS: tuple[SalusPollSensorDescription, ...] = (
+    SalusPollSensorDescription(
+        key="poll_duration",
+        name="Poll duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.metrics.timings["total"].last,
+        attributes_fn=lambda coordinator: {
+            **{
+                phase: stats.summary()
+                for phase, stats in coordinator.metrics.timings.items()
+            },
+            "polls_executed": coordinator.metrics.executed,
+            "polls_deduplicated": coordinator.metrics.deduplicated,
+        },
+    ),
+    SalusPollSensorDescription(
+        key="poll_errors",
+        name="Poll errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.metrics.errors,
+        attributes_fn=lambda coordinator: {
+            "consecutive_errors": coordinator.scheduler.consecutive_errors,
+            "last_error": coordinator.metrics.last_error,
+            **coordinator.session.as_dict(),
+            **coordinator.gateway.connection_stats,
+        },
+    ),
+    SalusPollSensorDescription(
+        key="changed_devices",
+        name="Changed devices",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.metrics.changed_count.last,
+        attributes_fn=lambda coordinator: coordinator.metrics.changed_count.summary(),
+    ),
+    SalusPollSensorDescription(
+        key="device_count",
+        name="Device count",
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.metrics.device_count,
+    ),
+    SalusPollSensorDescription(
+        key="payload_size",
+        name="Poll payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda coordinator: coordinator.metrics.payload_size.last,
+        attributes_fn=lambda coordinator: coordinator.metrics.payload_size.summary(),
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Salus sensors and the gateway's diagnostic sensors."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    commands = data["commands"]
+    coordinator = data["coordinator"]
+
+    entities: list[SensorEntity] = [
+        SalusSensor(coordinator, commands, device_id, device_data)
+        for device_id, device_data in coordinator.data.get("sensor", {}).items()
+    ]
+    entities.extend(
+        SalusPollSensor(coordinator, entry, description)
+        for description in POLL_SENSORS
+    )
+    async_add_entities(entities)
+
+
+class SalusSensor(SalusEntity, SensorEntity):
+    """Representation of a Salus sensor."""
+
+    _category = "sensor"
+    _default_name = "Salus Sensor"
+    _device: SensorState
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> Any:
+        """Return the value reported by the sensor."""
+        return self._device.native_value
+
+    @property
+    def native_unit_of_measurement(self) -> str | None:
+        """Return the unit of the reported value."""
+        unit = self._device.unit_of_measurement
+        return UNITS.get(unit, unit)
+
+    @property
+    def device_class(self) -> SensorDeviceClass | None:
+        """Return the device class reported by the gateway."""
+        try:
+            return SensorDeviceClass(self._device.device_class)
+        except ValueError:
+            return None
+
+
+class SalusPollSensor(CoordinatorEntity[SalusDataUpdateCoordinator], SensorEntity):
+    """Diagnostic sensor reporting on the gateway's poll cycle."""
+
+    entity_description: SalusPollSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: SalusDataUpdateCoordinator,
+        entry: ConfigEntry,
+        description: SalusPollSensorDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{entry.entry_id}_{description.key}"
+        self._attr_name = f"{entry.title} {description.name}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"gateway_{entry.entry_id}")},
+            name=entry.title,
+            manufacturer="Salus",
+            model=coordinator.gateway_type.upper(),
+        )
+
+    @property
+    def available(self) -> bool:
+        """Stay available while polls fail; that is what is reported."""
+        return True
+
+    @property
+    def native_value(self) -> Any:
+        """Return the measured value."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the percentiles and related counters."""
+        return self.entity_description.attributes_fn(self.coordinator)
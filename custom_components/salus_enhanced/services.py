@@ -0,0 +1,164 @@
+"""Services of the Salus Enhanced integration."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, ATTR_PRESET_MODE, HVACMode
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_TEMPERATURE
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import config_validation as cv, entity_registry as er
+
+from .capabilities import UnsupportedCommand, get_capabilities
+from .climate import HVAC_MODE_COMMANDS
+from .commands import GatewayCall
+from .const import BULK_CONCURRENCY, DOMAIN, SERVICE_BULK_SET
+
+_LOGGER = logging.getLogger(__name__)
+
+BULK_SET_SCHEMA = vol.All(
+    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE, ATTR_PRESET_MODE),
+    vol.Schema(
+        {
+            vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_HVAC_MODE): vol.In(
+                [str(mode) for mode in HVAC_MODE_COMMANDS]
+            ),
+            vol.Optional(ATTR_PRESET_MODE): cv.string,
+        }
+    ),
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_bulk_set(call: ServiceCall) -> ServiceResponse:
+        """Set many thermostats at once, refreshing each gateway once."""
+        return await _async_bulk_set(hass, call)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_SET,
+        async_bulk_set,
+        schema=BULK_SET_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _climate_entities(hass: HomeAssistant) -> dict[str, tuple[str, str]]:
+    """Map the unique id of every thermostat to its entry and device id."""
+    return {
+        f"{DOMAIN}_{device_id}_climate": (entry_id, device_id)
+        for entry_id, data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(data, dict) and "coordinator" in data
+        for device_id in (data["coordinator"].data or {}).get("climate", {})
+    }
+
+
+async def _async_bulk_set(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Send the commands of a bulk_set call, grouped by gateway."""
+    temperature = call.data.get(ATTR_TEMPERATURE)
+    hvac_mode = call.data.get(ATTR_HVAC_MODE)
+    preset_mode = call.data.get(ATTR_PRESET_MODE)
+
+    registry = er.async_get(hass)
+    thermostats = _climate_entities(hass)
+    results: dict[str, dict[str, Any]] = {}
+    # entry id -> device id -> entity id
+    targets: dict[str, dict[str, str]] = {}
+    for entity_id in call.data[ATTR_ENTITY_ID]:
+        entity = registry.async_get(entity_id)
+        if entity is None or (target := thermostats.get(entity.unique_id)) is None:
+            results[entity_id] = {"success": False, "error": "not a Salus thermostat"}
+            continue
+        entry_id, device_id = target
+        targets.setdefault(entry_id, {})[device_id] = entity_id
+
+    for entry_results in await asyncio.gather(
+        *(
+            _async_bulk_set_entry(
+                hass.data[DOMAIN][entry_id], devices, temperature, hvac_mode, preset_mode
+            )
+            for entry_id, devices in targets.items()
+        )
+    ):
+        results.update(entry_results)
+
+    failed = sorted(
+        entity_id for entity_id, result in results.items() if not result["success"]
+    )
+    if call.return_response:
+        return {"results": results}
+    if failed:
+        raise HomeAssistantError(
+            f"bulk_set failed for {len(failed)} of {len(results)} entities: "
+            + ", ".join(failed)
+        )
+    return None
+
+
+async def _async_bulk_set_entry(
+    data: dict[str, Any],
+    devices: dict[str, str],
+    temperature: float | None,
+    hvac_mode: str | None,
+    preset_mode: str | None,
+) -> dict[str, dict[str, Any]]:
+    """Set the thermostats of one gateway and refresh it once."""
+    coordinator = data["coordinator"]
+    gateway = data["gateway"]
+
+    calls: list[GatewayCall] = []
+    fields: dict[str, Any] = {}
+    mode = HVACMode(hvac_mode) if hvac_mode is not None else None
+    if mode is not None:
+        calls.append((gateway.set_climate_device_mode, (HVAC_MODE_COMMANDS[mode],)))
+        fields["hvac_mode"] = mode
+    if preset_mode is not None:
+        calls.append((gateway.set_climate_device_preset, (preset_mode,)))
+        fields["preset_mode"] = preset_mode
+    if temperature is not None:
+        calls.append((gateway.set_climate_device_temperature, (temperature,)))
+        fields["target_temperature"] = temperature
+
+    results: dict[str, dict[str, Any]] = {}
+    thermostats = coordinator.data.get("climate", {})
+    supported: list[str] = []
+    for device_id, entity_id in devices.items():
+        capabilities = get_capabilities(
+            coordinator.gateway_type, "climate", thermostats[device_id].model
+        )
+        try:
+            capabilities.validate(mode, preset_mode, temperature)
+        except UnsupportedCommand as err:
+            results[entity_id] = {"success": False, "error": str(err)}
+            continue
+        supported.append(device_id)
+        coordinator.async_set_pending("climate", device_id, **fields)
+
+    errors = await data["commands"].async_send_many(
+        dict.fromkeys(supported, calls), BULK_CONCURRENCY[coordinator.gateway_type]
+    )
+    for device_id, err in errors.items():
+        entity_id = devices[device_id]
+        if err is None:
+            results[entity_id] = {"success": True}
+            continue
+        _LOGGER.debug("bulk_set of %s failed: %s", entity_id, err)
+        coordinator.async_clear_pending("climate", device_id)
+        results[entity_id] = {"success": False, "error": str(err) or repr(err)}
+
+    coordinator.async_command_sent()
+    await coordinator.async_request_refresh()
+    return results
@@ -0,0 +1,113 @@
+"""Persistent storage for Salus Enhanced."""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from .models import STATE_TYPES
+
+STORAGE_KEY_IT500_TOKENS = f"{DOMAIN}.it500_tokens"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.snapshot"
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IT500TokenStore:
+    """salus-it500.com session tokens, keyed by username."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, dict[str, Any]]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_IT500_TOKENS, private=True
+        )
+        self._tokens: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the saved tokens once."""
+        if self._loaded:
+            return
+        self._tokens = await self._store.async_load() or {}
+        self._loaded = True
+
+    def get(self, username: str) -> str | None:
+        """Return the saved token of an account, if it has not expired."""
+        saved = self._tokens.get(username)
+        if saved is None or saved["expires"] <= time.time():
+            return None
+        return saved["token"]
+
+    @callback
+    def async_set(self, username: str, token: str, expires: float) -> None:
+        """Save the token of an account."""
+        self._tokens[username] = {"token": token, "expires": expires}
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def async_remove(self, username: str) -> None:
+        """Forget the token of an account."""
+        if self._tokens.pop(username, None) is not None:
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, dict[str, Any]]:
+        """Return the data to store."""
+        return self._tokens
+
+
+class SnapshotStore:
+    """Last known device snapshot of a config entry.
+
+    Records are stored as rows of field values, so the field names are not
+    repeated for every device.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY_SNAPSHOT}.{entry_id}"
+        )
+        self._data: dict[str, dict[str, Any]] = {}
+
+    async def async_load(self) -> dict[str, dict[str, Any]] | None:
+        """Return the saved snapshot, or None if there is none or it is unusable."""
+        if (stored := await self._store.async_load()) is None:
+            return None
+        snapshot: dict[str, dict[str, Any]] = {}
+        try:
+            for category, rows in stored.items():
+                if (state_type := STATE_TYPES.get(category)) is None:
+                    continue
+                snapshot[category] = {
+                    device_id: state_type.from_row(row)
+                    for device_id, row in rows.items()
+                }
+        except (TypeError, ValueError) as err:
+            _LOGGER.debug("Ignoring saved snapshot: %s", err)
+            return None
+        return snapshot
+
+    @callback
+    def async_schedule_save(self, data: dict[str, dict[str, Any]]) -> None:
+        """Save a snapshot, batching frequent updates."""
+        self._data = data
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Delete the saved snapshot."""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the snapshot as rows."""
+        return {
+            category: {
+                device_id: device.to_row() for device_id, device in devices.items()
+            }
+            for category, devices in self._data.items()
+        }
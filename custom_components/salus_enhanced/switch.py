@@ -0,0 +1,62 @@
+"""Support for Salus switches."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN
+from .entity import SalusEntity
+from .models import SwitchState
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up Salus switches."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    commands = data["commands"]
+    coordinator = data["coordinator"]
+
+    async_add_entities(
+        SalusSwitch(coordinator, commands, device_id, device_data)
+        for device_id, device_data in coordinator.data.get("switch", {}).items()
+    )
+
+
+class SalusSwitch(SalusEntity, SwitchEntity):
+    """Representation of a Salus switch."""
+
+    _category = "switch"
+    _default_name = "Salus Switch"
+    _device: SwitchState
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return true if the switch is on."""
+        return self._device.is_on
+
+    @property
+    def device_class(self) -> SwitchDeviceClass | None:
+        """Return the device class reported by the gateway."""
+        try:
+            return SwitchDeviceClass(self._device.device_class)
+        except ValueError:
+            return None
+
+    async def async_turn_on(self, **kwargs: Any) -> None:
+        """Turn the switch on."""
+        await self._async_send(
+            self._commands.async_turn_on_switch(self._device_id), is_on=True
+        )
+
+    async def async_turn_off(self, **kwargs: Any) -> None:
+        """Turn the switch off."""
+        await self._async_send(
+            self._commands.async_turn_off_switch(self._device_id), is_on=False
+        )
@@ -0,0 +1 @@
+"""Tests for the Salus Enhanced integration."""
@@ -0,0 +1,52 @@
+"""Fixtures for Salus Enhanced tests."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from custom_components.salus_enhanced.gateway import SalusGatewayBase
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load custom_components/salus_enhanced in every test."""
+
+
+class FakeGateway(SalusGatewayBase):
+    """Gateway without devices that counts its polls."""
+
+    def __init__(self) -> None:
+        """Initialize the gateway."""
+        self.polls = 0
+
+    async def connect(self) -> None:
+        """Connect to nothing."""
+
+    async def poll_status(self) -> dict[str, Any]:
+        """Return an empty snapshot."""
+        self.polls += 1
+        return {"climate": {}}
+
+    async def close(self) -> None:
+        """Close nothing."""
+
+    def get_climate_devices(self) -> dict[str, Any]:
+        """Get climate devices."""
+        return {}
+
+    def get_binary_sensor_devices(self) -> dict[str, Any]:
+        """Get binary sensor devices."""
+        return {}
+
+    def get_sensor_devices(self) -> dict[str, Any]:
+        """Get sensor devices."""
+        return {}
+
+    def get_switch_devices(self) -> dict[str, Any]:
+        """Get switch devices."""
+        return {}
+
+    def get_cover_devices(self) -> dict[str, Any]:
+        """Get cover devices."""
+        return {}
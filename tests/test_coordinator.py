@@ -0,0 +1,296 @@
+"""Tests for the Salus Enhanced coordinator."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from custom_components.salus_enhanced.commands import CommandQueue
+from custom_components.salus_enhanced.const import (
+    CONF_GATEWAY_TYPE,
+    DOMAIN,
+    GATEWAY_TYPE_IT600,
+    OPTIMISTIC_TIMEOUT,
+    POLL_JITTER_MAX,
+)
+from custom_components.salus_enhanced.coordinator import SalusDataUpdateCoordinator
+from custom_components.salus_enhanced.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.salus_enhanced.models import ClimateState
+from custom_components.salus_enhanced.scheduler import PollPhases, slot_phase
+
+from .conftest import FakeGateway
+
+
+class SlowGateway(FakeGateway):
+    """Gateway whose polls wait until they are let through."""
+
+    def __init__(self, error: Exception | None = None) -> None:
+        """Initialize the gateway, optionally failing its first poll."""
+        super().__init__()
+        self.release = asyncio.Event()
+        self._error = error
+
+    async def poll_status(self) -> dict[str, Any]:
+        """Wait for the release, then return a snapshot or fail."""
+        data = await super().poll_status()
+        await self.release.wait()
+        if (error := self._error) is not None:
+            self._error = None
+            raise error
+        return data
+
+
+class ThermostatGateway(FakeGateway):
+    """Gateway with one thermostat whose state the test sets."""
+
+    def __init__(self) -> None:
+        """Initialize the thermostat at 20 °C."""
+        super().__init__()
+        self.current = 19.0
+        self.target = 20.0
+
+    async def poll_status(self) -> dict[str, Any]:
+        """Return the thermostat's state."""
+        await super().poll_status()
+        return {
+            "climate": {
+                "t1": ClimateState(
+                    "t1",
+                    current_temperature=self.current,
+                    target_temperature=self.target,
+                )
+            }
+        }
+
+
+class RecordingSnapshotStore:
+    """Snapshot store that keeps what it was asked to save."""
+
+    def __init__(self) -> None:
+        """Initialize without saved snapshots."""
+        self.saved: list[dict[str, dict[str, Any]]] = []
+
+    def async_schedule_save(self, data: dict[str, dict[str, Any]]) -> None:
+        """Keep the snapshot."""
+        self.saved.append(data)
+
+
+async def _async_thermostat_coordinator(
+    hass: HomeAssistant, snapshot_store: RecordingSnapshotStore | None = None
+) -> tuple[ThermostatGateway, SalusDataUpdateCoordinator]:
+    """Return a polled coordinator whose thermostat is set to 22 °C pending."""
+    gateway = ThermostatGateway()
+    coordinator = SalusDataUpdateCoordinator(
+        hass, gateway, GATEWAY_TYPE_IT600, "test", snapshot_store
+    )
+    await coordinator.async_refresh()
+    coordinator.async_set_pending("climate", "t1", target_temperature=22.0)
+    assert coordinator.data["climate"]["t1"].target_temperature == 22.0
+    assert coordinator.is_pending("climate", "t1")
+    return gateway, coordinator
+
+
+async def _async_start_refreshes(
+    coordinator: SalusDataUpdateCoordinator, count: int
+) -> list[asyncio.Task[None]]:
+    """Start ``count`` concurrent refreshes and let them reach the gateway."""
+    tasks = [asyncio.create_task(coordinator.async_refresh()) for _ in range(count)]
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    return tasks
+
+
+async def test_phase_delays_scheduled_polls(hass: HomeAssistant) -> None:
+    """Scheduled polls start at the phase and then follow the interval."""
+    gateway = FakeGateway()
+    coordinator = SalusDataUpdateCoordinator(
+        hass, gateway, GATEWAY_TYPE_IT600, "test", phase=0.5
+    )
+    start = dt_util.utcnow()
+    phase_end = (
+        coordinator.scheduler.current_interval.total_seconds() * 0.5
+        + POLL_JITTER_MAX
+        + 1
+    )
+    await coordinator.async_refresh()
+    unsub = coordinator.async_add_listener(lambda: None)
+    interval = coordinator.scheduler.current_interval.total_seconds()
+
+    async_fire_time_changed(hass, start + timedelta(seconds=phase_end / 2))
+    await hass.async_block_till_done()
+    assert coordinator.update_interval is None
+    assert gateway.polls == 1
+
+    async_fire_time_changed(hass, start + timedelta(seconds=phase_end))
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == timedelta(seconds=interval)
+    assert gateway.polls == 1
+
+    async_fire_time_changed(hass, start + timedelta(seconds=phase_end + interval + 1))
+    await hass.async_block_till_done()
+    assert gateway.polls == 2
+
+    unsub()
+    await coordinator.async_shutdown()
+
+
+async def test_phase_without_listeners_is_cancelled(hass: HomeAssistant) -> None:
+    """Shutting down before the phase is reached schedules no poll."""
+    gateway = FakeGateway()
+    coordinator = SalusDataUpdateCoordinator(
+        hass, gateway, GATEWAY_TYPE_IT600, "test", phase=0.25
+    )
+    await coordinator.async_shutdown()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+    assert coordinator.update_interval is None
+    assert gateway.polls == 0
+
+
+async def test_concurrent_refreshes_share_polls(hass: HomeAssistant) -> None:
+    """Refreshes during a poll join one follow-up poll."""
+    gateway = SlowGateway()
+    coordinator = SalusDataUpdateCoordinator(hass, gateway, GATEWAY_TYPE_IT600, "test")
+    tasks = await _async_start_refreshes(coordinator, 30)
+    assert gateway.polls == 1
+
+    gateway.release.set()
+    await asyncio.gather(*tasks)
+
+    assert gateway.polls == 2
+    assert coordinator.last_update_success
+    await coordinator.async_shutdown()
+
+
+async def test_failed_poll_releases_joined_refreshes(hass: HomeAssistant) -> None:
+    """Refreshes that joined a failing poll return once its follow-up ran."""
+    gateway = SlowGateway(OSError("connection reset"))
+    coordinator = SalusDataUpdateCoordinator(hass, gateway, GATEWAY_TYPE_IT600, "test")
+    tasks = await _async_start_refreshes(coordinator, 30)
+
+    gateway.release.set()
+    await asyncio.gather(*tasks)
+
+    # the follow-up finds the session reconnecting and does not poll
+    assert gateway.polls == 1
+    assert not coordinator.last_update_success
+    assert coordinator.session.last_error == "OSError: connection reset"
+
+    # the next refresh polls again instead of waiting for a stale follow-up
+    coordinator.session.async_cancel()
+    await coordinator.async_refresh()
+    assert gateway.polls == 2
+    assert coordinator.last_update_success
+    await coordinator.async_shutdown()
+
+
+async def test_pending_state_confirmed(hass: HomeAssistant) -> None:
+    """Commanded values are shown until a poll reports them."""
+    snapshot_store = RecordingSnapshotStore()
+    gateway, coordinator = await _async_thermostat_coordinator(hass, snapshot_store)
+
+    # not applied yet: keep showing the commanded value, but save the polled one
+    gateway.current = 19.5
+    await coordinator.async_refresh()
+    assert coordinator.data["climate"]["t1"].target_temperature == 22.0
+    assert coordinator.is_pending("climate", "t1")
+    saved = snapshot_store.saved[-1]
+    assert saved["climate"]["t1"].target_temperature == 20.0
+    assert saved["climate"]["t1"].current_temperature == 19.5
+
+    gateway.target = 22.0
+    await coordinator.async_refresh()
+    assert coordinator.data["climate"]["t1"].target_temperature == 22.0
+    assert not coordinator.is_pending("climate", "t1")
+    await coordinator.async_shutdown()
+
+
+async def test_pending_state_contradicted(hass: HomeAssistant) -> None:
+    """A value changed to something else on the device replaces the command."""
+    gateway, coordinator = await _async_thermostat_coordinator(hass)
+
+    gateway.target = 18.0
+    await coordinator.async_refresh()
+    assert coordinator.data["climate"]["t1"].target_temperature == 18.0
+    assert not coordinator.is_pending("climate", "t1")
+    await coordinator.async_shutdown()
+
+
+async def test_pending_state_times_out(hass: HomeAssistant) -> None:
+    """Commanded values no poll confirmed are rolled back."""
+    gateway, coordinator = await _async_thermostat_coordinator(hass)
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=OPTIMISTIC_TIMEOUT + 1)
+    )
+    await hass.async_block_till_done()
+    assert coordinator.data["climate"]["t1"].target_temperature == 20.0
+    assert not coordinator.is_pending("climate", "t1")
+    assert gateway.polls == 1
+    await coordinator.async_shutdown()
+
+
+async def test_diagnostics_before_phase(hass: HomeAssistant) -> None:
+    """Diagnostics report the interval before scheduled polls start."""
+    gateway = FakeGateway()
+    coordinator = SalusDataUpdateCoordinator(
+        hass, gateway, GATEWAY_TYPE_IT600, "test", phase=0.5
+    )
+    entry = MockConfigEntry(domain=DOMAIN, data={CONF_GATEWAY_TYPE: GATEWAY_TYPE_IT600})
+    phases = PollPhases()
+    phases.assign(entry.entry_id, entry.entry_id)
+    hass.data[DOMAIN] = {
+        "poll_phases": phases,
+        entry.entry_id: {
+            "coordinator": coordinator,
+            "commands": CommandQueue(hass, gateway, coordinator),
+        },
+    }
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert coordinator.update_interval is None
+    assert diagnostics["poll"]["interval"] == (
+        coordinator.scheduler.current_interval.total_seconds()
+    )
+    assert diagnostics["poll"]["phases"] == {
+        entry.entry_id: {"slot": 0, "phase": 0.0, "entries": [entry.entry_id]}
+    }
+    await coordinator.async_shutdown()
+
+
+def test_poll_phases_are_spaced() -> None:
+    """Any n gateways poll at least 1 / (2 * n) of the interval apart."""
+    for count in range(1, 65):
+        phases = PollPhases()
+        taken = sorted(
+            phases.assign(f"entry_{index}", f"entry_{index}") for index in range(count)
+        )
+        gaps = [b - a for a, b in zip(taken, taken[1:])] + [1 + taken[0] - taken[-1]]
+        assert min(gaps) >= 1 / (2 * count)
+
+
+def test_poll_phases_are_stable() -> None:
+    """Phases do not depend on setup order and survive other gateways leaving."""
+    keys = [f"entry_{index}" for index in range(5)]
+    first = PollPhases()
+    first.reserve(keys)
+    second = PollPhases()
+    second.reserve(reversed(keys))
+    assert {key: first.assign(key, key) for key in keys} == {
+        key: second.assign(key, key) for key in reversed(keys)
+    }
+
+    kept = first.assign("entry_4", "entry_4")
+    first.release("entry_1")
+    assert first.assign("entry_4", "entry_4") == kept
+    assert first.assign("entry_5", "entry_5") == slot_phase(1)
@@ -0,0 +1,78 @@
+"""Tests for the LAN discovery of IT600 gateways."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+import pytest_socket
+
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import DEFAULT_EUID, GATEWAY_MAC, FakeIT600Gateway
+from custom_components.salus_enhanced.discovery import (
+    DiscoveredGateway,
+    async_identify_gateway,
+    async_scan,
+)
+
+
+HOSTS = ["127.0.0.1", "127.0.0.2", "127.0.0.3"]
+
+
+@pytest.fixture
+def loopback_hosts(socket_enabled: None) -> list[str]:
+    """Allow connections to a few loopback addresses."""
+    pytest_socket.socket_allow_hosts(HOSTS)
+    return HOSTS
+
+
+async def _close_right_away(
+    _reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    """Hang up on a client."""
+    writer.close()
+
+
+async def test_scan_finds_gateway(
+    hass: HomeAssistant, loopback_hosts: list[str]
+) -> None:
+    """Only the host answering the IT600 handshake is reported."""
+    gateway = FakeIT600Gateway(2)
+    await gateway.start("127.0.0.1")
+    # another service on the same port of a second loopback address
+    other = await asyncio.start_server(
+        _close_right_away, "127.0.0.2", gateway.port
+    )
+    try:
+        async with aiohttp.ClientSession() as session:
+            found = await async_scan(
+                session,
+                loopback_hosts,
+                port=gateway.port,
+                connect_timeout=1,
+                identify_timeout=1,
+            )
+    finally:
+        other.close()
+        await other.wait_closed()
+        await gateway.stop()
+
+    assert found == [DiscoveredGateway("127.0.0.1", DEFAULT_EUID, GATEWAY_MAC)]
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_identify_gateway_with_other_euid(hass: HomeAssistant) -> None:
+    """A gateway that does not decrypt the handshake is not identified."""
+    gateway = FakeIT600Gateway(0, euid="0123456789abcdef")
+    await gateway.start("127.0.0.1")
+    try:
+        async with aiohttp.ClientSession() as session:
+            assert (
+                await async_identify_gateway(
+                    session, "127.0.0.1", gateway.port, timeout=1
+                )
+                is None
+            )
+    finally:
+        await gateway.stop()
@@ -0,0 +1,156 @@
+"""Tests for the Salus Enhanced gateway wrappers."""
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from benchmarks.simulator import DEFAULT_EUID, FakeIT600Gateway
+from custom_components.salus_enhanced import async_setup
+from custom_components.salus_enhanced.gateway import (
+    IT500_MODE_FIELDS,
+    IT600_SESSION_POOL,
+    IT500CloudClient,
+    IT600Gateway,
+)
+
+
+@pytest.mark.usefixtures("socket_enabled")
+async def test_it600_failed_category_keeps_records(hass: HomeAssistant) -> None:
+    """A category that fails to read keeps its records; the poll succeeds."""
+    server = FakeIT600Gateway(10, change_rate=0)
+    await server.start()
+    gateway = IT600Gateway("127.0.0.1", DEFAULT_EUID, server.port)
+    try:
+        await gateway.connect()
+        first = await gateway.poll_status()
+        assert first["cover"]
+
+        with patch.object(
+            gateway._gateway,
+            "_refresh_cover_devices",
+            side_effect=KeyError("CurrentLevel"),
+        ):
+            second = await gateway.poll_status()
+        assert second["cover"] == first["cover"]
+        assert second["climate"]
+    finally:
+        await gateway.close()
+        await server.stop()
+
+
+class _FakeIT500Client:
+    """pyit500 client that records the writes it gets."""
+
+    def __init__(self) -> None:
+        """Initialize the client."""
+        self.writes: list[tuple[str, dict]] = []
+
+    async def async_set_device(self, device_id: str, values: dict) -> None:
+        """Record a write."""
+        self.writes.append((device_id, dict(values)))
+
+    async def async_get_device(self, device_id: str) -> dict:
+        """Return an empty device."""
+        return {}
+
+
+async def test_it600_session_closed_with_home_assistant(hass: HomeAssistant) -> None:
+    """The shared IT600 session is closed when Home Assistant closes."""
+    assert await async_setup(hass, {})
+    gateway = IT600Gateway("127.0.0.1", DEFAULT_EUID)
+    session = gateway._session
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert session.closed
+
+    await gateway.close()
+    assert IT600_SESSION_POOL.users == 0
+
+
+async def test_it500_conflicting_writes_rejected(hass: HomeAssistant) -> None:
+    """A write contradicting one waiting in the merge window is rejected."""
+    client = IT500CloudClient("user", "password")
+    client._client = fake = _FakeIT500Client()
+    client._token_verified = True
+
+    mode, preset, temperature = await asyncio.gather(
+        client.async_write("1", IT500_MODE_FIELDS["heat"]),
+        client.async_write("1", {"CH1autoOff": "auto"}),
+        client.async_write("1", {"CH1autoOff": "manual", "CH1currentSetPoint": 21}),
+        return_exceptions=True,
+    )
+    assert mode is None
+    assert isinstance(preset, ValueError)
+    assert temperature is None
+    assert fake.writes == [
+        (
+            "1",
+            {"CH1heatOffOn": 1, "CH1autoOff": "manual", "CH1currentSetPoint": 21},
+        )
+    ]
+
+
+class _FakeIT500Gateway:
+    """Registered gateway that counts the batch results pushed to it."""
+
+    def __init__(self, device_id: str) -> None:
+        """Initialize the gateway."""
+        self.device_id = device_id
+        self.pushed = 0
+
+    def handle_batch_result(self, raw: dict) -> None:
+        """Count a pushed result."""
+        self.pushed += 1
+
+
+async def test_it500_replaced_batch_fans_out_to_its_own_waiters(
+    hass: HomeAssistant,
+) -> None:
+    """A batch replaced while running skips the gateways that joined it."""
+    client = IT500CloudClient("user", "password")
+    client._client = _FakeIT500Client()
+    client._token_verified = True
+    gateways = {device_id: _FakeIT500Gateway(device_id) for device_id in "12"}
+    for gateway in gateways.values():
+        client.register(gateway)
+
+    first = asyncio.create_task(client.async_get_device("1"))
+    await asyncio.sleep(0)
+    gateways["3"] = _FakeIT500Gateway("3")
+    client.register(gateways["3"])
+    await asyncio.gather(first, client.async_get_device("3"))
+
+    # "1" polled the first batch and only gets the second pushed; "2"
+    # polled neither and gets both; "3" polled the second only
+    assert [gateways[device_id].pushed for device_id in "123"] == [1, 2, 0]
+
+
+class _FakeIT500Auth:
+    """pyit500 Auth whose logins take a while."""
+
+    def __init__(self) -> None:
+        """Initialize the auth."""
+        self.logins = 0
+
+    async def async_login(self) -> None:
+        """Log in."""
+        self.logins += 1
+        await asyncio.sleep(0.01)
+
+
+async def test_it500_reconnects_share_one_login(hass: HomeAssistant) -> None:
+    """The entries of an account reconnecting together log in once."""
+    client = IT500CloudClient("user", "password")
+    client._client = _FakeIT500Client()
+    client._auth = auth = _FakeIT500Auth()
+
+    await asyncio.gather(*(client.async_reconnect() for _ in range(3)))
+    await client.async_reconnect()
+    assert auth.logins == 1
+    assert client.relogin_count == 1
@@ -0,0 +1,167 @@
+"""Tests for the Salus Enhanced cloud request queue."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.salus_enhanced.ratelimit import CloudRequestQueue
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Initialize the clock at 0."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+class ThrottledError(Exception):
+    """Error a throttling cloud answers with."""
+
+    def __init__(self, retry_after: float | None = None) -> None:
+        """Initialize the error, optionally with a Retry-After header."""
+        super().__init__("429 Too Many Requests")
+        self.status = 429
+        self.headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+
+
+def _queue(clock: FakeClock, **kwargs: float) -> CloudRequestQueue:
+    """Return a queue with the given limits, and generous defaults."""
+    limits = {
+        "rate": 10.0,
+        "burst": 10.0,
+        "max_concurrency": 1,
+        "min_rate": 1.0,
+        "throttle_pause": 10.0,
+        "retries": 2,
+        **kwargs,
+    }
+    return CloudRequestQueue(clock=clock, **limits)
+
+
+async def _async_settle() -> None:
+    """Let the tasks woken by the queue run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def _async_advance(hass: HomeAssistant, clock: FakeClock, seconds: float) -> None:
+    """Move the clock forward and fire the queue's timers that are due."""
+    clock.now += seconds
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=clock.now))
+    await _async_settle()
+
+
+async def test_priority_order() -> None:
+    """Waiting requests start lowest priority first, in order within one."""
+    queue = _queue(FakeClock())
+    release = asyncio.Event()
+    started: list[str] = []
+
+    async def request(name: str) -> None:
+        started.append(name)
+        if name == "blocker":
+            await release.wait()
+
+    tasks = [asyncio.create_task(queue.async_call(0, request, "blocker"))]
+    await _async_settle()
+    for priority, name in ((2, "low"), (0, "high_a"), (1, "mid"), (0, "high_b")):
+        tasks.append(asyncio.create_task(queue.async_call(priority, request, name)))
+    await _async_settle()
+    assert queue.queue_depth == 4
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert started == ["blocker", "high_a", "high_b", "mid", "low"]
+    assert queue.as_dict()["requests"] == 5
+
+
+async def test_throttle_halves_rate_pauses_and_retries(hass: HomeAssistant) -> None:
+    """A 429 halves the rate, pauses the queue and queues the request again."""
+    clock = FakeClock()
+    queue = _queue(clock, rate=4.0, burst=4.0)
+    calls = 0
+
+    async def request() -> str:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise ThrottledError(retry_after=30)
+        return "ok"
+
+    task = asyncio.create_task(queue.async_call(0, request))
+    await _async_settle()
+    assert calls == 1
+    assert queue.as_dict()["rate"] == 2.0
+    assert queue.as_dict()["paused_for"] == 30.0
+
+    await _async_advance(hass, clock, 29)
+    assert not task.done()
+
+    await _async_advance(hass, clock, 1)
+    assert await task == "ok"
+    assert calls == 2
+    stats = queue.as_dict()
+    assert stats["requests"] == 1
+    assert stats["throttled"] == 1
+    # the success wins back a step of the configured rate
+    assert stats["rate"] == 2.2
+
+
+async def test_throttle_gives_up_after_retries(hass: HomeAssistant) -> None:
+    """A request throttled more than ``retries`` times raises."""
+    clock = FakeClock()
+    queue = _queue(clock, rate=4.0, retries=1)
+
+    async def request() -> None:
+        raise ThrottledError()
+
+    task = asyncio.create_task(queue.async_call(0, request))
+    await _async_settle()
+    assert queue.as_dict()["paused_for"] == 10.0
+
+    await _async_advance(hass, clock, 10)
+    assert isinstance(task.exception(), ThrottledError)
+    stats = queue.as_dict()
+    assert stats["requests"] == 1
+    assert stats["throttled"] == 1
+    assert stats["rate"] == 2.0
+    assert stats["in_flight"] == 0
+
+
+async def test_cancelled_waiter_hands_on_its_turn() -> None:
+    """A waiter cancelled after being let through frees its turn."""
+    queue = _queue(FakeClock())
+    release = asyncio.Event()
+
+    async def request(name: str) -> str:
+        if name == "blocker":
+            await release.wait()
+        return name
+
+    blocker = asyncio.create_task(queue.async_call(0, request, "blocker"))
+    await _async_settle()
+    cancelled = asyncio.create_task(queue.async_call(0, request, "cancelled"))
+    waiting = asyncio.create_task(queue.async_call(0, request, "waiting"))
+    await _async_settle()
+
+    # the blocker lets the first waiter through, which is cancelled before
+    # it gets to run
+    release.set()
+    await asyncio.sleep(0)
+    assert blocker.done()
+    cancelled.cancel()
+
+    async with asyncio.timeout(1):
+        assert await waiting == "waiting"
+    assert cancelled.cancelled()
+    assert queue.as_dict()["in_flight"] == 0
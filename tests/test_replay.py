@@ -0,0 +1,31 @@
+"""Tests for the trace replay benchmark."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_replay_counts_recorded_errors() -> None:
+    """Every recorded snapshot and error is replayed exactly once."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.replay",
+            str(Path(__file__).parent / "fixtures" / "errors.trace"),
+        ],
+        cwd=ROOT,
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=60,
+    )
+    report = json.loads(result.stdout)
+    assert report["snapshots"] == 3
+    assert report["poll_errors"] == 2
+    assert report["entities"] == 1
+    assert report["refresh_ms"] and report["refresh_ms"]["max"] < 1000